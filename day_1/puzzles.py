@@ -1,4 +1,8 @@
+import numpy as np
+
 EXPENSE_REPORT_FILE = "expense_report.txt"
+EXPENSE_SUM = 2020
+TARGET_CHUNK_SIZE = 2**22 # max. number of (target, value) combinations checked at once
 
 def get_list_of_expenses():
     """ Return the values of the expense report as a list of integers """
@@ -9,20 +13,179 @@ def get_list_of_expenses():
 
     return expenses_list
 
+def get_array_of_expenses():
+    """ Return the values of the expense report as sorted numpy array of integers """
+    expenses_array = np.fromfile(EXPENSE_REPORT_FILE, dtype=np.int64, sep='\n')
+    expenses_array.sort()
+
+    return expenses_array
+
+# -------------------------- k-sum engine --------------------------
+
+def find_pair_with_sum(expenses_list, target):
+    """
+    Walk through the list once and remember every value seen so far in a
+    hash-set. As soon as the complement of the current value (target - value)
+    was already seen, both values are returned. Each entry of the list is used
+    at most once, i.e. a value is never paired with itself (unless it occurs
+    twice in the list). In case no pair is found, None is returned.
+    """
+    seen_expenses = set()
+
+    for expense_value in expenses_list:
+        if target - expense_value in seen_expenses:
+            return target - expense_value, expense_value
+        seen_expenses.add(expense_value)
+
+    return None
+
+def find_k_values_in_sorted_list(sorted_expenses, k, target, start_idx):
+    """
+    Find k values in the ascending sorted list (starting at given index) which
+    add up to the target. For k = 2 two pointers are moved towards each other
+    from both ends of the list, for larger k the first value is fixed and the
+    remaining k - 1 values are searched recursively to its right.
+    In case no values are found, None is returned.
+    """
+    if k == 2:
+        left_idx = start_idx
+        right_idx = len(sorted_expenses) - 1
+        while left_idx < right_idx:
+            current_sum = sorted_expenses[left_idx] + sorted_expenses[right_idx]
+            if current_sum == target:
+                return [sorted_expenses[left_idx], sorted_expenses[right_idx]]
+            if current_sum < target:
+                left_idx += 1
+            else:
+                right_idx -= 1
+        return None
+
+    for idx in range(start_idx, len(sorted_expenses) - k + 1):
+        # same value as before -> same result as in the previous iteration
+        if idx > start_idx and sorted_expenses[idx] == sorted_expenses[idx - 1]:
+            continue
+
+        remaining_values = find_k_values_in_sorted_list(sorted_expenses, k - 1,\
+                                                        target - sorted_expenses[idx], idx + 1)
+        if remaining_values is not None:
+            return [sorted_expenses[idx]] + remaining_values
+
+    return None
+
+def find_k_expenses(expenses_list, k, target=EXPENSE_SUM):
+    """
+    Find k (distinct) entries of the list of expenses which add up to the
+    given target and return them as a tuple. For k = 2 a single pass using a
+    hash-set is done (O(n)), for k >= 3 the list is sorted once and searched
+    with two pointers (O(n^(k-1))). In case no values are found, None is returned.
+    """
+    if k < 1:
+        raise ValueError("k has to be at least 1, got {}".format(k))
+
+    if k == 1:
+        return (target,) if target in expenses_list else None
+
+    if k == 2:
+        return find_pair_with_sum(expenses_list, target)
+
+    k_values = find_k_values_in_sorted_list(sorted(expenses_list), k, target, 0)
+    return tuple(k_values) if k_values is not None else None
+
+# -------------------------- Vectorized k-sum (numpy) --------------------------
+
+def get_mask_of_available_complements(sorted_expenses, values, complements):
+    """
+    For each value, check if its complement is contained in the sorted array
+    of expenses: 'np.searchsorted' returns the left and right bound of each
+    complement, their difference is the number of its occurrences. In case
+    complement and value are equal, the value itself does not count.
+    """
+    lower_bounds = np.searchsorted(sorted_expenses, complements, side='left')
+    upper_bounds = np.searchsorted(sorted_expenses, complements, side='right')
+    nb_of_complements = upper_bounds - lower_bounds - (complements == values)
+
+    return nb_of_complements > 0
+
+def find_pair_with_sum_vectorized(sorted_expenses, target, start_idx=0):
+    """
+    Find two values in the sorted array (starting at given index) which add up
+    to the target by looking up all complements at once. In case no pair is
+    found, None is returned.
+    """
+    sub_expenses = sorted_expenses[start_idx:]
+    complements = target - sub_expenses
+    pair_idxs = np.flatnonzero(get_mask_of_available_complements(sub_expenses, sub_expenses,\
+                                                                 complements))
+    if pair_idxs.size == 0:
+        return None
+
+    return int(sub_expenses[pair_idxs[0]]), int(complements[pair_idxs[0]])
+
+def find_triple_with_sum_vectorized(sorted_expenses, target):
+    """
+    Find three values in the sorted array which add up to the target: fix the
+    first value and search the remaining pair to its right vectorized.
+    In case no triple is found, None is returned.
+    """
+    for idx in range(len(sorted_expenses) - 2):
+        # same value as before -> same result as in the previous iteration
+        if idx > 0 and sorted_expenses[idx] == sorted_expenses[idx - 1]:
+            continue
+
+        # array is sorted, i.e. all following values are too large
+        if 3 * sorted_expenses[idx] > target:
+            break
+
+        pair = find_pair_with_sum_vectorized(sorted_expenses, target - sorted_expenses[idx], idx + 1)
+        if pair is not None:
+            return (int(sorted_expenses[idx]),) + pair
+
+    return None
+
+def find_pairs_for_targets_vectorized(sorted_expenses, targets):
+    """
+    Find one pair of values adding up to the respective target for a whole
+    batch of targets in one pass over the sorted array: the array is split into
+    chunks and the complements of all targets are looked up for each chunk
+    at once. Return a dictionary {target : (a, b)}, with None for each target
+    no pair was found for.
+    """
+    targets = np.unique(np.asarray(targets, dtype=np.int64))
+    pairs = np.zeros((len(targets), 2), dtype=np.int64)
+    found = np.zeros(len(targets), dtype=bool)
+    chunk_size = max(1, TARGET_CHUNK_SIZE // max(1, len(targets)))
+
+    for chunk_start in range(0, len(sorted_expenses), chunk_size):
+        open_targets = targets[~found]
+        if open_targets.size == 0:
+            break
+
+        values = sorted_expenses[chunk_start:chunk_start + chunk_size]
+        complements = open_targets[:, np.newaxis] - values[np.newaxis, :]
+        matches = get_mask_of_available_complements(sorted_expenses, values, complements)
+
+        # first value of the chunk which has a matching complement per target
+        matched_targets = np.flatnonzero(matches.any(axis=1))
+        matched_values = matches[matched_targets].argmax(axis=1)
+        open_idxs = np.flatnonzero(~found)[matched_targets]
+        pairs[open_idxs, 0] = values[matched_values]
+        pairs[open_idxs, 1] = complements[matched_targets, matched_values]
+        found[open_idxs] = True
+
+    return {int(target): (tuple(int(value) for value in pair) if is_found else None)\
+            for target, pair, is_found in zip(targets, pairs, found)}
+
 # -------------------------- Puzzle 1 --------------------------
 
 def find_two_expenses(expenses_list):
     """
-    Imagine a matrix with row and colum representing the given list of
-    expenses. Check if row and colum value add up to 2020 and if so,
+    Find two entries of the list of expenses which add up to 2020 and if so,
     return both values. In case no value is found, return a default of 0.
     """
-    for expense_value_1 in expenses_list:
-        for expense_value_2 in expenses_list:
-            if expense_value_1 + expense_value_2 == 2020:
-                print("[+] Found following two values: {} + {} = 2020" \
-                      .format(expense_value_1, expense_value_2))
-                return expense_value_1, expense_value_2
+    two_expenses = find_k_expenses(expenses_list, 2)
+    if two_expenses is not None:
+        print("[+] Found following two values: {} + {} = 2020".format(*two_expenses))
+        return two_expenses
 
     print("[!] Did not find two values 'a' and 'b' which met the condition: sum(a,b) = 2020")
     return 0, 0
@@ -31,25 +194,36 @@ def find_two_expenses(expenses_list):
 
 def find_three_expenses(expenses_list):
     """
-    Imagine a tensor with row, colum and depth representing the given list of
-    expenses. Check if row, colum and depth value add up to 2020 and if so,
+    Find three entries of the list of expenses which add up to 2020 and if so,
     return all three values. In case no value is found, return a default of 0.
     """
-    for expense_value_1 in expenses_list:
-        for expense_value_2 in expenses_list:
-            for expense_value_3 in expenses_list:
-                if expense_value_1 + expense_value_2 + expense_value_3 == 2020:
-                    print("[+] Found following three values: {} + {} + {} = 2020" \
-                          .format(expense_value_1, expense_value_2, expense_value_3))
-                    return expense_value_1, expense_value_2, expense_value_3
+    three_expenses = find_k_expenses(expenses_list, 3)
+    if three_expenses is not None:
+        print("[+] Found following three values: {} + {} + {} = 2020".format(*three_expenses))
+        return three_expenses
 
     print("[!] Did not find three values 'a', 'b' and 'c' which met the condition: sum(a,b,c) = 2020")
     return 0, 0, 0
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
-def compute_solution_of_puzzle():
-    """ Find the numbers which add up to 2020 and return their product. """
+def compute_solution_of_puzzle(use_numpy=False):
+    """
+    Find the numbers which add up to 2020 and return their product.
+    In case 'use_numpy' is set, the vectorized numpy-variants are used.
+    """
+    if use_numpy:
+        expenses_array = get_array_of_expenses()
+        expense_1, expense_2 = find_pair_with_sum_vectorized(expenses_array, EXPENSE_SUM) or (0, 0)
+        print("[+] Solution of day1/puzzle1: {} * {} = {}".format(expense_1, expense_2,\
+                                                                 expense_1 * expense_2))
+
+        expense_1, expense_2, expense_3 = find_triple_with_sum_vectorized(expenses_array, EXPENSE_SUM)\
+                                          or (0, 0, 0)
+        print("[+] Solution of day1/puzzle2: {} * {} * {} = {}".format(expense_1, expense_2, expense_3,\
+                                                                       expense_1 * expense_2 * expense_3))
+        return
+
     expenses_list = get_list_of_expenses()
 
     expense_1, expense_2 = find_two_expenses(expenses_list)
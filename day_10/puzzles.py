@@ -1,4 +1,9 @@
+from collections import deque
+
+import numpy as np
+
 OUTPUT_JOLTAGE_FILE = "output_joltage.txt"
+MAX_JOLTAGE_DIFFERENCE = 3
 
 def get_output_joltage_list():
     """ Return the content of above file as a list of values. """
@@ -14,44 +19,41 @@ def get_output_joltage_list():
 
 def find_number_of_n_jolt_differences(sorted_joltage_list):
     """
-    First of all, sort given input list. Then, count the difference of n and n-1 element: If it is 1
-    increment the count of 1-difference, if it is 3 increment the count of 3-difference.
+    Count the difference of n and n-1 element of given sorted input list and return the count of
+    1-differences and the count of 3-differences.
 
     Notes:
     - The rating of the charging-outlet is 0 jolts: First value to consider when calculating the difference.
-    - Since your device's built-in adapter is always 3 higher, increment 3-difference count at the end.
+    - Since your device's built-in adapter is always 3 higher, the last difference is always 3.
     """
+    difference_histogram, _ = get_joltage_difference_histogram(sorted_joltage_list)
 
-    difference_1 = 0
-    difference_3 = 0
+    return int(difference_histogram[1]), int(difference_histogram[3])
 
-    def increment_diff(cur_diff):
-        nonlocal difference_1
-        nonlocal difference_3
-
-        if cur_diff == 1:
-            difference_1 += 1
-        elif cur_diff == 3:
-            difference_3 += 1
+def get_joltage_difference_histogram(sorted_joltage_list, max_jump=MAX_JOLTAGE_DIFFERENCE):
+    """
+    Compute all differences of the chain charging-outlet (0), adapters, device (last adapter + 3) at once
+    and count them: the n-th entry of the returned histogram is the number of n-differences.
+    Furthermore, return all gaps larger than 'max_jump' as array of (lower, upper) joltage pairs, e.g.
+    [[4, 9]] if there are no adapters between 4 and 9 jolts (with max_jump = 3).
+    """
+    joltage_array = np.asarray(sorted_joltage_list, dtype=np.int64)
+    device_joltage = joltage_array[-1] + MAX_JOLTAGE_DIFFERENCE if joltage_array.size else MAX_JOLTAGE_DIFFERENCE
+    joltage_chain = np.concatenate(([0], joltage_array, [device_joltage]))
 
-    # first difference: from charging-outlet to first joltage adapter
-    increment_diff(sorted_joltage_list[0] - 0)
-    
-    # iterate over list and count differences
-    for i in range(1, len(sorted_joltage_list)):
-        cur_diff = sorted_joltage_list[i] - sorted_joltage_list[i - 1]
-        increment_diff(cur_diff)
+    joltage_differences = np.diff(joltage_chain)
+    difference_histogram = np.bincount(joltage_differences, minlength=max_jump + 1)
 
-    # last difference: from joltage adapters to device: difference of 3
-    increment_diff(3)
+    gap_idxs = np.flatnonzero(joltage_differences > max_jump)
+    joltage_gaps = np.column_stack((joltage_chain[gap_idxs], joltage_chain[gap_idxs + 1]))
 
-    return difference_1, difference_3
+    return difference_histogram, joltage_gaps
 
 # -------------------------- Puzzle 2 --------------------------
 
 def get_device_joltage(sorted_joltage_list):
     """ Increment the last element by 3 and return it as the device's jolt value. """
-    return (sorted_joltage_list[-1]) + 3
+    return (sorted_joltage_list[-1]) + MAX_JOLTAGE_DIFFERENCE
 
 def get_all_ways_to_connect_to_charging_outlet(sorted_joltage_list, device_joltage):
     """
@@ -66,60 +68,47 @@ def get_all_ways_to_connect_to_charging_outlet(sorted_joltage_list, device_jolta
 
     return find_all_ways_efficiently(combined_joltage_list)
 
-def find_all_ways_efficiently(joltage_list):
+def find_all_ways_efficiently(joltage_list, max_jump=MAX_JOLTAGE_DIFFERENCE):
     """
-    Iterate through given 'joltage_list' and check for every list-element (:= node) how many possible
-    ways to proceed from there exist, i.e. how many of the following three elements are within the
-    intervall [node + 1 : node + 3].
-
-    For example, let joltage-list be [0,1,4,5,6,7]. The only possible way to continue from 0 is 1 as
-    it is the only node reachable by adding 1, 2 or 3. However, from node 4 on, we can go to 5,
-    6 or 7, each is within the intervall [4+1 :  4+3].
-    
-    For each node in given list, check if it branches next, i.e. more than one other node can be found
-    as next possible node. If so count the number of branches (1, 2, 3). If it branches the first time,
-    do not forget to remove the default branch --> reduce number of branches by 1. While branched, sum
-    up the following number of branches. If a 'leaf-node' is reached, multiply the overall number of
-    branches by the number of subbranches found.
-
-    As an example, take above joltage-list:
-    1) 0 --> next nodes: 1 --> nothing happens, still 1 branch
-    2) 1 --> next nodes: 4 --> nothing happens, still 1 branch
-    3) 4 --> next nodes: 5,6,7 --> we are branching --> sum of subbranches = 3
-    4) 5 --> next nodes: 6,7 --> we are already branched --> sum of subbranches = 4 (= 3 + 2 - 1 (:= remove default branch))
-    5) 6 --> next nodes: 7 --> we left branched way --> sum of total branches = 4 (= 1 * 4)
-    6) and so on
+    Iterate once through given sorted 'joltage_list' (charging-outlet first, device last) and count for
+    every list-element (:= node) the number of ways to reach it: the sum of the ways to reach each of the
+    previous nodes which are within the intervall [node - max_jump : node - 1]. The number of ways of the
+    last node is returned (exact, as python integers do not overflow).
+
+    For example, let joltage-list be [0,1,4,5,6,7]:
+    1) 0 --> start: 1 way
+    2) 1 --> reachable from 0: 1 way
+    3) 4 --> reachable from 1: 1 way
+    4) 5 --> reachable from 4: 1 way
+    5) 6 --> reachable from 4, 5: 1 + 1 = 2 ways
+    6) 7 --> reachable from 4, 5, 6: 1 + 1 + 2 = 4 ways
+
+    Note: Only the ways of the previous nodes within the intervall are kept in a sliding window together
+    with their sum, i.e. each node enters and leaves the window once, independent of 'max_jump'.
     """
-    all_possible_branches = 1 # default path
-    sum_of_sub_branches = 0
+    if not joltage_list:
+        return 0
 
-    currently_branched = False
-    remove_default_branch = False
-    
-    for node in joltage_list:
-        # compute possible next nodes
-        nb_of_next_nodes = len([node + i for i in range(1, 4) if (node + i) in joltage_list])
-        
-        if not currently_branched:
-            # check if list branches, e.g. more than 1 node could be next
-            if nb_of_next_nodes > 1:
-                sum_of_sub_branches = nb_of_next_nodes
-                currently_branched = True
-                remove_default_branch = True
-        else:
-            # 'leaf-node' reached, e.g. no branches anymore only 1 node can be next
-            if nb_of_next_nodes == 1:
-                currently_branched = False
-                all_possible_branches *= sum_of_sub_branches
-            else:
-                # everytime the list branches, the default branch needs to be removed once
-                if remove_default_branch:
-                    sum_of_sub_branches += (len(next_nodes) - 1)
-                    remove_default_branch = False
-                else:                   
-                    sum_of_sub_branches += len(next_nodes)
-
-    return all_possible_branches
+    window = deque() # (node, ways) of previous nodes which are within reach
+    window_sum = 0
+    # (node, ways) of previous nodes not added to the window yet (nodes of equal joltage cannot reach each other)
+    pending_nodes = deque([(joltage_list[0], 1)]) # only one way to reach the first node (:= start)
+    ways = 1
+
+    for node in joltage_list[1:]:
+        # add previous nodes
+        while pending_nodes and pending_nodes[0][0] < node:
+            window.append(pending_nodes.popleft())
+            window_sum += window[-1][1]
+
+        # remove previous nodes which are out of reach
+        while window and window[0][0] < node - max_jump:
+            window_sum -= window.popleft()[1]
+
+        ways = window_sum
+        pending_nodes.append((node, ways))
+
+    return ways
 
 def find_all_ways(joltage_list):
     """
@@ -6,6 +6,13 @@ SEAT_EMPTY = 0
 SEAT_OCCUPIED = 1
 FLOOR = -1
 
+# (row, col) steps to the eight adjacent positions
+ADJACENT_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# simulate incrementally once the neighbours of the seats changed in a round are less than this fraction
+# of all seats (a whole round of puzzle 1 sums up shifted views only, thus it is cheaper than of puzzle 2)
+INCREMENTAL_ROUNDS_FRACTION_PUZZLE_1 = 0.1
+INCREMENTAL_ROUNDS_FRACTION_PUZZLE_2 = 1.5
+
 def get_seat_layout_matrix():
     """
     Return the content of above file as a matrix:
@@ -36,324 +43,270 @@ def simulate_rounds_until_stabilization(seat_layout, is_puzzle_1=True):
     """
     Start simulating different rounds, always changing the seat_layout. Once the layout does
     not change anymore, a stable state is reached. Then, stop simulation and return the current
-    seat layout.
+    seat layout and a list holding the number of changed seats per round.
     If 'is_puzzle_1' is set, the simulation for puzzle 1 is executed, otw. for puzzle 2
     """
     current_seat_layout = seat_layout.copy()
-    current_round = 1
+    changed_seats_per_round = []
 
     # set function to be run depending on the given flag
-    simulate_one_round = simulate_one_round_puzzle_1 if is_puzzle_1 else\
-                         simulate_one_round_puzzle_2
+    if is_puzzle_1:
+        simulate_one_round = simulate_one_round_puzzle_1
+    else:
+        # seats which can be seen from each other never change -> look them up once
+        line_of_sight_table = create_line_of_sight_table(seat_layout)
+        simulate_one_round = lambda seat_layout: simulate_one_round_puzzle_2(seat_layout, line_of_sight_table)
 
     while(True):
-        print("Round #{}".format(current_round))
-
         simulated_seat_layout = simulate_one_round(current_seat_layout)
+        nb_of_changed_seats = int(np.count_nonzero(current_seat_layout != simulated_seat_layout))
 
         # stable state reached?
-        if np.all(current_seat_layout == simulated_seat_layout):
+        if nb_of_changed_seats == 0:
             break
+        changed_seats_per_round.append(nb_of_changed_seats)
 
         # update current seat layout matrix
         current_seat_layout = simulated_seat_layout
-        current_round += 1
-
-    return current_seat_layout
-
-def number_of_occupied_seats(surrounding_seat_area):
-    """
-    Check, how many occupied seats (:= 1) are within given 'surrounding_seat_area':
-    """
-    return np.sum(surrounding_seat_area==SEAT_OCCUPIED)
-
-# -------------------------- Puzzle 1 --------------------------
-
-def simulate_one_round_puzzle_1(current_seat_layout):
-    """
-    Simulate one round of seat occupying / leaving according to following rules:
-    - if a seat is empty and there are no occupied adjascent seats within range of 8 seats,
-      the seat becomes occupied
-    - if a seat is occupied and there are four or more adjacent seats occupied,
-      the seat becomes empty
-    """
-    simulated_seat_layout = current_seat_layout.copy()
-    max_row_idx, max_col_idx = current_seat_layout.shape
-
-    # iterate over each matrix element and check adjacent 8 neighbours
-    for row_idx, row in enumerate(current_seat_layout):
-        for col_idx, col in enumerate(row):
-            # only consider seats
-            if col != FLOOR:
-                # create surrounding area
-                top, bottom, left, right = compute_surrounding_area(row_idx, col_idx,\
-                                                                    max_row_idx, max_col_idx)
-                surrounding_seat_area = current_seat_layout[top : bottom, left : right]
-
-                nb_of_occupied_seats = number_of_occupied_seats(surrounding_seat_area)
-
-                if col == SEAT_EMPTY:
-                    if nb_of_occupied_seats == 0:
-                        # no occupied seats -> seat occupied from now on
-                        simulated_seat_layout[row_idx, col_idx] = SEAT_OCCUPIED
-
-                elif col == SEAT_OCCUPIED:
-                    if nb_of_occupied_seats > 4:
-                        # 4 or more occupied seats (without current seat) -> seat is empty from now on
-                        simulated_seat_layout[row_idx, col_idx] = SEAT_EMPTY
-
-    return simulated_seat_layout
-
-def compute_surrounding_area(row_idx, col_idx, max_row_idx, max_col_idx):
-    """
-    Use given input to calculate the indices required for spinning up the surrounding area
-    by taking only adjacent seats into account.
-    Adjacent seats are defined to be one of the eight positions to the lef, right, above,
-    below or diagonal to current seat.
-    """
-    top = row_idx - 1 if (row_idx - 1) > 0 else 0
-    bottom = row_idx + 2 if (row_idx + 2) < max_row_idx else max_row_idx
-    left = col_idx - 1 if (col_idx - 1) > 0 else 0
-    right = col_idx + 2 if (col_idx + 2) < max_col_idx else max_col_idx
-
-    return top, bottom, left, right
-
-# -------------------------- Puzzle 2 --------------------------
-
-def simulate_one_round_puzzle_2(current_seat_layout):
-    """
-    Simulate one round of seat occupying / leaving according to following rules:
-    - if all adjacent seats (which can be seen from current seat) are empty, occupy seat
-    - if 5 or more adjacent seats (whic can be seen from current seat) are occupied, leave seat
-    """
-    simulated_seat_layout = current_seat_layout.copy()
 
-    # iterate over each matrix element and check adjacent neighbours
-    for row_idx, row in enumerate(current_seat_layout):
-        for col_idx, col in enumerate(row):
-            # only consider seats
-            if col != FLOOR:
-                number_of_occupied_seats = number_of_occupied_seats_seen_from_current_seat(current_seat_layout,\
-                                                                                           row_idx, col_idx)
-                if col == SEAT_EMPTY:
-                    if number_of_occupied_seats == 0:
-                        # no occupied seats -> seat occupied from now on
-                        simulated_seat_layout[row_idx, col_idx] = SEAT_OCCUPIED
-
-                elif col == SEAT_OCCUPIED:
-                    if number_of_occupied_seats >= 5:
-                        # 5 or more occupied seats (without current seat) -> seat is empty from now on
-                        simulated_seat_layout[row_idx, col_idx] = SEAT_EMPTY
+    return current_seat_layout, changed_seats_per_round
 
-    return simulated_seat_layout
-
-def number_of_occupied_seats_seen_from_current_seat(current_seat_layout, row, col):
-    """
-    From current seat, look to the right, left, top, bottom, top-right, bottom-left,
-    top-left, bottom-right and check the first seat which can be seen.
-    Return the total number of occupied seats seen from current position.
+def simulate_rounds_incrementally(seat_layout, is_puzzle_1=True):
     """
-    number_of_occupied_seats = 0
-
-    number_of_occupied_seats += (1 if is_right_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_left_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_top_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_bottom_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_top_left_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_bottom_right_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_top_right_seat_occupied(current_seat_layout, row, col) else 0)
-    number_of_occupied_seats += (1 if is_bottom_left_seat_occupied(current_seat_layout, row, col) else 0)
-
-    return number_of_occupied_seats
+    Same as above, but once the changes of a round affect only a small fraction of all seats (see
+    INCREMENTAL_ROUNDS_FRACTION_*), only the seats whose number of occupied (adjacent or visible)
+    neighbours changed in the last round are checked again. Return the current seat layout and a
+    list holding the number of changed seats per round.
+    If 'is_puzzle_1' is set, the simulation for puzzle 1 is executed, otw. for puzzle 2
 
-def is_right_seat_occupied(current_seat_layout, row, col):
-    """
-    Starting from current seat (row, col) go to the right until the first seat is found.
-    Return true if it is occupied, false otw.
+    Note: Being neighbours is symmetric (adjacent seats as well as the first seats seen in opposite
+    directions), so the number of occupied neighbours of each seat is kept up to date by adding +1/-1
+    for each neighbour of a changed seat. A seat whose number did not change keeps its state.
     """
-    is_seat_occupied = False
+    if is_puzzle_1:
+        simulate_one_round = simulate_one_round_puzzle_1
+        min_occupied_to_leave = 4
+        incremental_rounds_fraction = INCREMENTAL_ROUNDS_FRACTION_PUZZLE_1
+    else:
+        # seats which can be seen from each other never change -> look them up once
+        line_of_sight_table = create_line_of_sight_table(seat_layout)
+        simulate_one_round = lambda seat_layout: simulate_one_round_puzzle_2(seat_layout, line_of_sight_table)
+        min_occupied_to_leave = 5
+        incremental_rounds_fraction = INCREMENTAL_ROUNDS_FRACTION_PUZZLE_2
+
+    nb_of_seats = np.count_nonzero(seat_layout != FLOOR)
+    current_seat_layout = seat_layout.copy()
+    changed_seats_per_round = []
 
-    i = 0 # iterating index
+    # simulate whole rounds as long as the changes affect a large fraction of all seats
     while(True):
-        i += 1
+        simulated_seat_layout = simulate_one_round(current_seat_layout)
+        nb_of_changed_seats = int(np.count_nonzero(current_seat_layout != simulated_seat_layout))
+        current_seat_layout = simulated_seat_layout
 
-        # out of range?
-        if (col + i) >= current_seat_layout.shape[1]:
-            break
+        # stable state reached?
+        if nb_of_changed_seats == 0:
+            return current_seat_layout, changed_seats_per_round
+        changed_seats_per_round.append(nb_of_changed_seats)
 
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row, col + i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row, col + i] == SEAT_OCCUPIED)
+        if nb_of_changed_seats * len(ADJACENT_DIRECTIONS) < incremental_rounds_fraction * nb_of_seats:
             break
 
-    return is_seat_occupied
+    seat_positions, neighbour_seat_ids = create_adjacency_table(seat_layout) if is_puzzle_1 else line_of_sight_table
+    # last entry is gathered for seat-id -1 (:= no neighbour) and is never occupied
+    occupied_seats = np.append(current_seat_layout.ravel()[seat_positions] == SEAT_OCCUPIED, False)
+    number_of_occupied_neighbours = occupied_seats[neighbour_seat_ids].sum(axis=1)
+    # index of the entry (of the affected seats of a round) representing each seat
+    seat_marks = np.empty(nb_of_seats, dtype=np.int64)
+    seats_to_check = np.arange(nb_of_seats)
+
+    while seats_to_check.size:
+        is_occupied = occupied_seats[seats_to_check]
+        nb_occupied = number_of_occupied_neighbours[seats_to_check]
+        becomes_occupied = ~is_occupied & (nb_occupied == 0)
+        becomes_empty = is_occupied & (nb_occupied >= min_occupied_to_leave)
+        changed_seats = seats_to_check[becomes_occupied | becomes_empty]
+
+        if changed_seats.size == 0:
+            break
+        changed_seats_per_round.append(len(changed_seats))
 
-def is_left_seat_occupied(current_seat_layout, row, col):
-    """
-    Starting from current seat (row, col) go to the left until the first seat is found.
-    Return true if it is occupied, false otw.
-    """
-    is_seat_occupied = False
+        # update the occupied seats and collect their neighbours with +1/-1 each
+        occupied_seats[changed_seats] = ~occupied_seats[changed_seats]
+        neighbours = neighbour_seat_ids[changed_seats]
+        has_neighbour = neighbours >= 0
+        affected_seats = neighbours[has_neighbour]
+        deltas = np.broadcast_to(np.where(occupied_seats[changed_seats], 1, -1)[:, np.newaxis],\
+                                 neighbours.shape)[has_neighbour]
 
-    i = 0 # iterating index
-    while(True):
-        i += 1
+        # number the affected seats consecutively (w/o sorting them) and sum up their deltas
+        entry_idxs = np.arange(len(affected_seats))
+        seat_marks[affected_seats] = entry_idxs
+        representative_idxs = seat_marks[affected_seats]
+        is_representative = representative_idxs == entry_idxs
+        compact_seat_ids = np.cumsum(is_representative) - 1
+        neighbour_deltas = np.bincount(compact_seat_ids[representative_idxs], weights=deltas).astype(np.int64)
 
-        # out of range?
-        if (col - i) < 0:
-            break
+        affected_seats = affected_seats[is_representative]
+        number_of_occupied_neighbours[affected_seats] += neighbour_deltas
+        seats_to_check = affected_seats[neighbour_deltas != 0]
 
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row, col - i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row, col - i] == SEAT_OCCUPIED)
-            break
+    current_seat_layout.ravel()[seat_positions] = np.where(occupied_seats[:-1], SEAT_OCCUPIED, SEAT_EMPTY)
 
-    return is_seat_occupied
+    return current_seat_layout, changed_seats_per_round
 
-def is_top_seat_occupied(current_seat_layout, row, col):
+def number_of_occupied_seats(surrounding_seat_area):
     """
-    Starting from current seat (row, col) go to the top until the first seat is found.
-    Return true if it is occupied, false otw.
+    Check, how many occupied seats (:= 1) are within given 'surrounding_seat_area':
     """
-    is_seat_occupied = False
-
-    i = 0 # iterating index
-    while(True):
-        i += 1
-
-        # out of range?
-        if (row - i) < 0:
-            break
-
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row - i, col] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row - i, col] == SEAT_OCCUPIED)
-            break
+    return np.sum(surrounding_seat_area==SEAT_OCCUPIED)
 
-    return is_seat_occupied
+# -------------------------- Puzzle 1 --------------------------
 
-def is_bottom_seat_occupied(current_seat_layout, row, col):
+def simulate_one_round_puzzle_1(current_seat_layout):
     """
-    Starting from current seat (row, col) go to the bottom until the first seat is found.
-    Return true if it is occupied, false otw.
+    Simulate one round of seat occupying / leaving according to following rules:
+    - if a seat is empty and there are no occupied adjascent seats within range of 8 seats,
+      the seat becomes occupied
+    - if a seat is occupied and there are four or more adjacent seats occupied,
+      the seat becomes empty
+    All seats are updated at once using boolean masks.
     """
-    is_seat_occupied = False
-
-    i = 0 # iterating index
-    while(True):
-        i += 1
-
-        # out of range?
-        if (row + i) >= current_seat_layout.shape[0]:
-            break
+    simulated_seat_layout = current_seat_layout.copy()
+    nb_of_occupied_adjacent_seats = count_occupied_adjacent_seats(current_seat_layout)
 
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row + i, col] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row + i, col] == SEAT_OCCUPIED)
-            break
+    # no occupied seats -> seat occupied from now on
+    simulated_seat_layout[(current_seat_layout == SEAT_EMPTY) & (nb_of_occupied_adjacent_seats == 0)] = SEAT_OCCUPIED
+    # 4 or more occupied seats -> seat is empty from now on
+    simulated_seat_layout[(current_seat_layout == SEAT_OCCUPIED) & (nb_of_occupied_adjacent_seats >= 4)] = SEAT_EMPTY
 
-    return is_seat_occupied
+    return simulated_seat_layout
 
-def is_top_left_seat_occupied(current_seat_layout, row, col):
-    """
-    Starting from current seat (row, col) go to the top-left until the first seat is found.
-    Return true if it is occupied, false otw.
+def count_occupied_adjacent_seats(current_seat_layout):
     """
-    is_seat_occupied = False
-
-    i = 0 # iterating index
-    while(True):
-        i += 1
+    Return a matrix holding the number of occupied adjacent seats for each position of the layout.
+    Adjacent seats are defined to be one of the eight positions to the lef, right, above,
+    below or diagonal to current seat.
 
-        # out of range?
-        if (row - i) < 0 or (col - i) < 0:
-            break
+    Note: The occupied seats are padded with a border of zeros, so that the counts of all positions
+    are computed by summing up the eight shifted views of the padded matrix.
+    """
+    nb_rows, nb_cols = current_seat_layout.shape
+    padded_occupied_seats = np.pad((current_seat_layout == SEAT_OCCUPIED).astype(np.int8), 1)
+    nb_of_occupied_adjacent_seats = np.zeros((nb_rows, nb_cols), dtype=np.int8)
 
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row - i, col - i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row - i, col - i] == SEAT_OCCUPIED)
-            break
+    for row_shift, col_shift in ADJACENT_DIRECTIONS:
+        nb_of_occupied_adjacent_seats += padded_occupied_seats[1 + row_shift : 1 + row_shift + nb_rows,\
+                                                               1 + col_shift : 1 + col_shift + nb_cols]
 
-    return is_seat_occupied
+    return nb_of_occupied_adjacent_seats
 
-def is_bottom_right_seat_occupied(current_seat_layout, row, col):
+def create_adjacency_table(seat_layout):
     """
-    Starting from current seat (row, col) go to the bottom-right until the first seat is found.
-    Return true if it is occupied, false otw.
+    Number all seats of given layout (row by row) and return
+    - their positions within the flattened layout
+    - a (number of seats x 8) matrix holding the seat-ids of the adjacent seats in each of the
+      eight directions (see ADJACENT_DIRECTIONS), -1 if there is none (floor or out of range)
     """
-    is_seat_occupied = False
+    nb_rows, nb_cols = seat_layout.shape
+    seat_positions = np.flatnonzero(seat_layout != FLOOR)
+    # seat-ids padded with a border of -1 (:= no seat)
+    padded_seat_ids = np.full((nb_rows + 2, nb_cols + 2), -1, dtype=np.int32)
+    seat_ids = np.full(nb_rows * nb_cols, -1, dtype=np.int32)
+    seat_ids[seat_positions] = np.arange(len(seat_positions), dtype=np.int32)
+    padded_seat_ids[1:-1, 1:-1] = seat_ids.reshape(nb_rows, nb_cols)
 
-    i = 0 # iterating index
-    while(True):
-        i += 1
+    adjacent_seat_ids = np.empty((len(seat_positions), len(ADJACENT_DIRECTIONS)), dtype=np.int32)
 
-        # out of range?
-        if (row + i) >= current_seat_layout.shape[0] or (col + i) >= current_seat_layout.shape[1]:
-            break
+    for direction_idx, (row_shift, col_shift) in enumerate(ADJACENT_DIRECTIONS):
+        adjacent_seat_ids[:, direction_idx] = padded_seat_ids[1 + row_shift : 1 + row_shift + nb_rows,\
+                                                              1 + col_shift : 1 + col_shift + nb_cols].ravel()[seat_positions]
 
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row + i, col + i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row + i, col + i] == SEAT_OCCUPIED)
-            break
+    return seat_positions, adjacent_seat_ids
 
-    return is_seat_occupied
+# -------------------------- Puzzle 2 --------------------------
 
-def is_top_right_seat_occupied(current_seat_layout, row, col):
+def simulate_one_round_puzzle_2(current_seat_layout, line_of_sight_table=None):
     """
-    Starting from current seat (row, col) go to the top-right until the first seat is found.
-    Return true if it is occupied, false otw.
+    Simulate one round of seat occupying / leaving according to following rules:
+    - if all adjacent seats (which can be seen from current seat) are empty, occupy seat
+    - if 5 or more adjacent seats (whic can be seen from current seat) are occupied, leave seat
+    The seats which can be seen are looked up in the given 'line_of_sight_table' (created once if
+    not given), so that all seats are updated at once.
     """
-    is_seat_occupied = False
+    if line_of_sight_table is None:
+        line_of_sight_table = create_line_of_sight_table(current_seat_layout)
+    seat_positions, visible_seat_ids = line_of_sight_table
 
-    i = 0 # iterating index
-    while(True):
-        i += 1
-
-        # out of range?
-        if (row - i) < 0 or (col + i) >= current_seat_layout.shape[1]:
-            break
-
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row - i, col + i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row - i, col + i] == SEAT_OCCUPIED)
-            break
+    simulated_seat_layout = current_seat_layout.copy()
+    seats = current_seat_layout.ravel()[seat_positions]
+    # last entry is gathered for seat-id -1 (:= no seat visible) and is never occupied
+    occupied_seats = np.append(seats == SEAT_OCCUPIED, False).astype(np.int8)
+    number_of_occupied_seats = occupied_seats[visible_seat_ids].sum(axis=1)
+
+    simulated_seats = seats.copy()
+    # no occupied seats -> seat occupied from now on
+    simulated_seats[(seats == SEAT_EMPTY) & (number_of_occupied_seats == 0)] = SEAT_OCCUPIED
+    # 5 or more occupied seats -> seat is empty from now on
+    simulated_seats[(seats == SEAT_OCCUPIED) & (number_of_occupied_seats >= 5)] = SEAT_EMPTY
+    simulated_seat_layout.ravel()[seat_positions] = simulated_seats
 
-    return is_seat_occupied
+    return simulated_seat_layout
 
-def is_bottom_left_seat_occupied(current_seat_layout, row, col):
+def create_line_of_sight_table(seat_layout):
     """
-    Starting from current seat (row, col) go to the top-right until the first seat is found.
-    Return true if it is occupied, false otw.
+    Number all seats of given layout (row by row) and return
+    - their positions within the flattened layout
+    - a (number of seats x 8) matrix holding the seat-ids of the first seat which can be seen in each
+      of the eight directions (see ADJACENT_DIRECTIONS) from each seat, -1 if there is none
+
+    Note: As floor positions never change, the table has to be created only once. For each direction,
+    the layout is swept row by row (column by column for left/right) starting at the border it looks
+    to: the first seat seen from a position is the seat next to it, or the one seen from the position
+    next to it, in case it is floor.
     """
-    is_seat_occupied = False
-    max_positions_bottom_left = min(current_seat_layout.shape[0] - row, col)
-
-    i = 0 # iterating index
-    while(True):
-        i += 1
-
-        # out of range?
-        if (row + i) >= current_seat_layout.shape[0] or (col - i) < 0:
-            break
-
-        # once a seat was reached, stop and set flag accordingly
-        if current_seat_layout[row + i, col - i] != FLOOR:
-            is_seat_occupied = (current_seat_layout[row + i, col - i] == SEAT_OCCUPIED)
-            break
-
-    return is_seat_occupied
+    nb_rows, nb_cols = seat_layout.shape
+    is_seat = seat_layout != FLOOR
+    seat_positions = np.flatnonzero(is_seat)
+    seat_ids = np.full((nb_rows, nb_cols), -1, dtype=np.int32)
+    seat_ids.ravel()[seat_positions] = np.arange(len(seat_positions), dtype=np.int32)
+
+    visible_seat_ids = np.empty((len(seat_positions), len(ADJACENT_DIRECTIONS)), dtype=np.int32)
+
+    for direction_idx, (row_shift, col_shift) in enumerate(ADJACENT_DIRECTIONS):
+        seen_seat_ids = np.full((nb_rows, nb_cols), -1, dtype=np.int32)
+        # first seat seen when looking from a position, including the position itself
+        seen_from_here = np.where(is_seat, seat_ids, -1)
+
+        if row_shift != 0:
+            # columns of the positions (and the positions next to them) which stay within the layout
+            next_cols = np.arange(nb_cols) + col_shift
+            valid_cols = np.flatnonzero((next_cols >= 0) & (next_cols < nb_cols))
+            rows = range(nb_rows - 2, -1, -1) if row_shift > 0 else range(1, nb_rows)
+            for row in rows:
+                seen_seat_ids[row, valid_cols] = seen_from_here[row + row_shift, next_cols[valid_cols]]
+                seen_from_here[row] = np.where(is_seat[row], seat_ids[row], seen_seat_ids[row])
+        else:
+            cols = range(nb_cols - 2, -1, -1) if col_shift > 0 else range(1, nb_cols)
+            for col in cols:
+                seen_seat_ids[:, col] = seen_from_here[:, col + col_shift]
+                seen_from_here[:, col] = np.where(is_seat[:, col], seat_ids[:, col], seen_seat_ids[:, col])
+
+        visible_seat_ids[:, direction_idx] = seen_seat_ids.ravel()[seat_positions]
+
+    return seat_positions, visible_seat_ids
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
 def compute_solution_of_puzzle():
     """ Find the total number of occupied seats once the layout of above map does not change anymore """
     seat_layout_matrix = get_seat_layout_matrix()
-    stable_seat_layout = simulate_rounds_until_stabilization(seat_layout_matrix)
+    stable_seat_layout, _ = simulate_rounds_until_stabilization(seat_layout_matrix)
     nb_of_occupied_seats = number_of_occupied_seats(stable_seat_layout)
 
     print("[+] Solution of day11/puzzle1: There are {} seats occupied in the end. ".format(nb_of_occupied_seats))
 
-    stable_seat_layout = simulate_rounds_until_stabilization(seat_layout_matrix, is_puzzle_1=False)
+    stable_seat_layout, _ = simulate_rounds_until_stabilization(seat_layout_matrix, is_puzzle_1=False)
     nb_of_occupied_seats = number_of_occupied_seats(stable_seat_layout)
 
     print("[+] Solution of day11/puzzle2: There are {} seats occupied in the end. ".format(nb_of_occupied_seats))
@@ -1,15 +1,36 @@
-from enum import IntEnum
+from array import array
+
+import numpy as np
 
 NAVIGATION_INSTRUCTIONS_FILE = "navigation_instructions.txt"
 
 INSTRUCTION = "instruction"
 VALUE = "value"
 
-class FacingPosition(IntEnum):
-    NORTH = 0,
-    EAST = 1,
-    SOUTH = 2,
-    WEST = 3
+# instructions as numbers, N/E/S/W first (index into DIRECTIONS)
+ACTION_CODES = {'N': 0, 'E': 1, 'S': 2, 'W': 3, 'L': 4, 'R': 5, 'F': 6}
+# unit moves of N/E/S/W as complex numbers (E := real part, N := imaginary part)
+DIRECTIONS = np.array([1j, 1, -1j, -1])
+# k quarter turns to the left := 1j^k
+QUARTER_TURNS = np.array([1, 1j, -1, -1j])
+WAYPOINT_START = 10 + 1j
+
+# unit moves of N/E/S/W as (E, N) steps
+DIRECTION_STEPS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+# E and N steps of each instruction (index := action code, no step for L/R/F)
+DIRECTION_STEPS_EAST, DIRECTION_STEPS_NORTH = np.array(DIRECTION_STEPS + [(0, 0)] * 3, dtype=np.int64).T
+# k quarter turns to the left := (E, N) -> (E * cos - N * sin, E * sin + N * cos)
+QUARTER_TURNS_COS = np.array([1, 0, -1, 0], dtype=np.int64)
+QUARTER_TURNS_SIN = np.array([0, 1, 0, -1], dtype=np.int64)
+CHECKPOINT_INTERVAL = 4096 # instructions between two stored states
+
+# keys of the navigation checkpoints
+CHECKPOINT_INTERVAL_KEY = "interval"
+IS_PUZZLE_1_KEY = "is_puzzle_1"
+SHIP_EAST_KEY = "ship_east"
+SHIP_NORTH_KEY = "ship_north"
+VECTOR_EAST_KEY = "vector_east"
+VECTOR_NORTH_KEY = "vector_north"
 
 def create_navigation_instructions_list():
     """
@@ -29,245 +50,225 @@ def create_navigation_instructions_list():
 
     return navigation_instructions_list
 
+# -------------------------- Vectorized navigation (complex numbers) --------------------------
+
+def compile_navigation_instructions(navigation_instructions_list):
+    """
+    Compile given 'navigation_instructions_list' into two numpy arrays (one entry per instruction):
+    - the instructions as numbers (see ACTION_CODES)
+    - the respective values
+    """
+    actions = np.fromiter((ACTION_CODES[navigation_instruction[INSTRUCTION]]\
+                           for navigation_instruction in navigation_instructions_list),\
+                          dtype=np.int8, count=len(navigation_instructions_list))
+    values = np.fromiter((navigation_instruction[VALUE] for navigation_instruction in navigation_instructions_list),\
+                         dtype=np.int64, count=len(navigation_instructions_list))
+
+    return actions, values
+
+def get_cumulative_quarter_turns(actions, values):
+    """
+    Return the number of quarter turns to the left (0..3) which is applied after each instruction in
+    total, i.e. the cumulative sum of all left (+) and right (-) quarter turns modulo 4.
+    """
+    quarter_turns = np.where(actions == ACTION_CODES['L'], values // 90, 0) -\
+                    np.where(actions == ACTION_CODES['R'], values // 90, 0)
+
+    return np.cumsum(quarter_turns) % 4
+
+def get_cumulative_rotations(actions, values):
+    """
+    Return the rotation (as complex number, 1j^k := k times 90 degrees to the left) which is applied
+    after each instruction in total (see above).
+    """
+    return QUARTER_TURNS[get_cumulative_quarter_turns(actions, values)]
+
+def get_direction_moves(actions, values):
+    """ Return the move (as complex number, E := real part, N := imaginary part) of each N/E/S/W instruction """
+    return np.where(actions < len(DIRECTIONS), DIRECTIONS[np.minimum(actions, len(DIRECTIONS) - 1)], 0) * values
+
+def compute_ship_trajectory(actions, values):
+    """
+    Return the position of the ship (as complex number, E := real part, N := imaginary part) after
+    each instruction, starting from position E:0, N:0 facing east (puzzle 1):
+    - N/E/S/W move the ship directly
+    - L/R rotate the heading by multiplying it with 1j^k, i.e. the heading before each instruction is the
+      cumulative rotation of the previous instructions
+    - F moves the ship along the current heading
+    Summing up all moves cumulatively results in the whole trajectory at once.
+
+    Note: Positions are computed as floats, i.e. they are exact as long as they stay below 2^53.
+    """
+    headings = np.concatenate(([1 + 0j], get_cumulative_rotations(actions, values)[:-1]))
+    moves = get_direction_moves(actions, values) + np.where(actions == ACTION_CODES['F'], headings * values, 0)
+
+    return np.cumsum(moves)
+
+def compute_ship_trajectory_along_waypoint(actions, values):
+    """
+    Return the position of the ship (as complex number) after each instruction, starting from position
+    E:0, N:0 with the waypoint at E:10, N:1 (puzzle 2):
+    - N/E/S/W move the waypoint, L/R rotate it around the ship, F moves the ship towards it
+
+    Note: With R_t being the cumulative rotation after instruction t, the waypoint after instruction t is
+    R_t * (w_0 + sum(move_s / R_s)) over all s <= t. This allows to compute all waypoints (and the ship's
+    trajectory) by cumulative sums. As R_s is a power of 1j, dividing by it is exact.
+    """
+    moves = np.where(actions == ACTION_CODES['F'], compute_waypoint_track(actions, values) * values, 0)
+
+    return np.cumsum(moves)
+
+def compute_waypoint_track(actions, values):
+    """ Return the position of the waypoint (as complex number) after each instruction (puzzle 2, see above) """
+    rotations = get_cumulative_rotations(actions, values)
+
+    return rotations * (WAYPOINT_START + np.cumsum(get_direction_moves(actions, values) / rotations))
+
+def get_east_north_position(trajectory):
+    """ Return the last position of given trajectory as integers (E, N), E:0, N:0 if it is empty """
+    if len(trajectory) == 0:
+        return 0, 0
+
+    return int(round(trajectory[-1].real)), int(round(trajectory[-1].imag))
+
 # -------------------------- Puzzle 1 --------------------------
 
 def navigate_ship(navigation_instructions_list):
     """
     Starting from position E:0, N:0. In the beginning the ship is facing east.
-    Iterate through the whole instruction list and update current position accordingly.
+    Follow the whole instruction list and return the final position (E, N).
     """
-    east_position = 0
-    north_position = 0
-    facing_position = FacingPosition.EAST
-    
-    for navigation_instruction in navigation_instructions_list:
-        instruction = navigation_instruction[INSTRUCTION]
-        value = navigation_instruction[VALUE]
-
-        # update ship position accordingly
-        if instruction == 'N':
-            north_position += value
-        elif instruction == 'E':
-            east_position += value
-        elif instruction == 'S':
-            north_position -= value
-        elif instruction == 'W':
-            east_position -= value
-
-        # turn ship around or move forward
-        elif instruction == 'L' or instruction == 'R':
-            facing_position = turn_to_position(facing_position, instruction, value)
-        elif instruction == 'F':
-            forward_east, forward_north = ship_forward(facing_position, value)
-            east_position += forward_east
-            north_position += forward_north
-
-    return east_position, north_position
-
-def ship_forward(current_facing_position, value):
-    """ Depending on given 'current_facing_position' ship 'value' steps forward. """
-    forward_to_the_east = 0
-    forward_to_the_north = 0
-
-    if current_facing_position == FacingPosition.EAST:
-        forward_to_the_east += value
-    elif current_facing_position == FacingPosition.SOUTH:
-        forward_to_the_north -= value
-    elif current_facing_position == FacingPosition.WEST:
-        forward_to_the_east -= value
-    elif current_facing_position == FacingPosition.NORTH:
-        forward_to_the_north += value
-
-    return forward_to_the_east, forward_to_the_north
-
-def turn_to_position(current_facing_position, instruction, value):
-    """ Return the updated facing position when instruction got applied. """
-    updated_facing_position = current_facing_position
-    
-    if instruction == 'L':
-        for i in range(value // 90):
-            updated_facing_position = turn_90_degrees_to_the_left(updated_facing_position)
-    elif instruction == 'R':
-        for i in range(value // 90):
-            updated_facing_position = turn_90_degrees_to_the_right(updated_facing_position)
-
-    return updated_facing_position
-
-def turn_90_degrees_to_the_right(current_facing_position):
-    """ Turn around by 90 degrees to the right. """
-    updated_facing_position = None
-
-    if current_facing_position == FacingPosition.EAST:
-        updated_facing_position = FacingPosition.SOUTH
-    elif current_facing_position == FacingPosition.SOUTH:
-        updated_facing_position = FacingPosition.WEST
-    elif current_facing_position == FacingPosition.WEST:
-        updated_facing_position = FacingPosition.NORTH
-    elif current_facing_position == FacingPosition.NORTH:
-        updated_facing_position = FacingPosition.EAST
-
-    return updated_facing_position
-
-def turn_90_degrees_to_the_left(current_facing_position):
-    """ Turn around by 90 degrees to the left. """
-    updated_facing_position = None
-
-    if current_facing_position == FacingPosition.EAST:
-        updated_facing_position = FacingPosition.NORTH
-    elif current_facing_position == FacingPosition.NORTH:
-        updated_facing_position = FacingPosition.WEST
-    elif current_facing_position == FacingPosition.WEST:
-        updated_facing_position = FacingPosition.SOUTH
-    elif current_facing_position == FacingPosition.SOUTH:
-        updated_facing_position = FacingPosition.EAST
-        
-    return updated_facing_position
+    return get_east_north_position(compute_ship_trajectory(*compile_navigation_instructions(navigation_instructions_list)))
 
 # -------------------------- Puzzle 2 --------------------------
 
 def navigate_ship_along_waypoint(navigation_instructions_list):
     """
     Starting from position E:0, N:0. In the beginning the ship is facing east.
-    Iterate through the whole instruction list and update current position accordingly.
+    Follow the whole instruction list and return the final position (E, N).
     Additional information in comparison to puzzle 1: The instructions are now applied to
     a waypoint which starts at E:10, N:1. 
     """
-    ship_east_position = 0
-    ship_north_position = 0
-    waypoint_east_position = 10
-    waypoint_north_position = 1
-    
-    for navigation_instruction in navigation_instructions_list:
-        instruction = navigation_instruction[INSTRUCTION]
-        value = navigation_instruction[VALUE]
-
-        # update waypoint position accordingly
-        if instruction == 'N':
-            waypoint_north_position += value
-        elif instruction == 'E':
-            waypoint_east_position += value
-        elif instruction == 'S':
-            waypoint_north_position -= value
-        elif instruction == 'W':
-            waypoint_east_position -= value
-
-        # rotate waypoint around ship or move ship towards waypoint
-        elif instruction == 'L' or instruction == 'R':
-            waypoint_east_position, waypoint_north_position = rotate_waypoint((waypoint_east_position,\
-                                                                               waypoint_north_position),\
-                                                                               instruction, value)
-        elif instruction == 'F':
-            ship_east_position, ship_north_position = ship_forward_to_waypoint((ship_east_position,\
-                                                                                ship_north_position),\
-                                                                               (waypoint_east_position,\
-                                                                                waypoint_north_position),\
-                                                                               value)
-
-    return ship_east_position, ship_north_position
-
-def ship_forward_to_waypoint(ship_position, waypoint_position, value):
+    return get_east_north_position(compute_ship_trajectory_along_waypoint(\
+                                       *compile_navigation_instructions(navigation_instructions_list)))
+
+# -------------------------- Checkpointed trajectory queries --------------------------
+
+def apply_navigation_instruction(state, action, value, is_puzzle_1=True):
     """
-    Depending on given 'waypoint_position' ship 'value' steps forward towards the way-point.
-    Both positions are given as tuples (E, N).
-    Return the updated position of the ship
+    Apply a single compiled instruction to given state (ship E, ship N, vector E, vector N) and return
+    the updated state. The vector is the heading of the ship (puzzle 1) or the waypoint (puzzle 2):
+    - N/E/S/W move the ship (puzzle 1) or the waypoint (puzzle 2)
+    - L/R rotate the vector in steps of 90 degrees: (E, N) -> (-N, E) to the left
+    - F moves the ship 'value' times along the vector
     """
-    ship_east_pos = ship_position[0]
-    ship_north_pos = ship_position[1]
-    wp_east_pos = waypoint_position[0]
-    wp_north_pos = waypoint_position[1]
+    ship_east, ship_north, vector_east, vector_north = state
+
+    if action < len(DIRECTION_STEPS):
+        step_east, step_north = DIRECTION_STEPS[action]
+        if is_puzzle_1:
+            ship_east, ship_north = ship_east + step_east * value, ship_north + step_north * value
+        else:
+            vector_east, vector_north = vector_east + step_east * value, vector_north + step_north * value
+
+    elif action == ACTION_CODES['F']:
+        ship_east, ship_north = ship_east + vector_east * value, ship_north + vector_north * value
+
+    else:
+        quarter_turns = value // 90 if action == ACTION_CODES['L'] else -(value // 90)
+        for _ in range(quarter_turns % 4):
+            vector_east, vector_north = -vector_north, vector_east
+
+    return ship_east, ship_north, vector_east, vector_north
 
-    ship_east_pos += (wp_east_pos * value)
-    ship_north_pos += (wp_north_pos * value)
+def rotate_by_quarter_turns(east, north, quarter_turns):
+    """ Rotate given vectors (E, N) by given numbers of quarter turns (0..3) to the left """
+    cos, sin = QUARTER_TURNS_COS[quarter_turns], QUARTER_TURNS_SIN[quarter_turns]
 
-    return ship_east_pos, ship_north_pos
+    return east * cos - north * sin, east * sin + north * cos
 
-def rotate_waypoint(waypoint_position, instruction, value):
+def compute_navigation_states(actions, values, is_puzzle_1=True):
     """
-    Rotate current waypoint position around the ship depending on given 'instruction'
-    (:= 'L' or 'R'). The position is provided as tuple (E, N)
-    Return updated waypoint position.
+    Return the states after each instruction as four 64-bit integer arrays (ship E, ship N, vector E,
+    vector N), computed by cumulative sums like the trajectories above, but with exact integers:
+    rotations are looked up in the (cos, sin) tables of the cumulative quarter turns. The states are
+    exact as long as they fit into 64 bits.
+
+    Note: As F never rotates the vector, the vector after an F instruction is the one it moves along.
     """
-    updated_waypoint_position = waypoint_position
-    
-    if instruction == 'L':
-        for i in range(value // 90):
-            updated_waypoint_position = rotate_waypoint_90_degrees_to_the_left(updated_waypoint_position)
-
-    elif instruction == 'R':
-        for i in range(value // 90):
-            updated_waypoint_position = rotate_waypoint_90_degrees_to_the_right(updated_waypoint_position)
-            
-    return updated_waypoint_position
-
-def rotate_waypoint_90_degrees_to_the_left(waypoint):
-    """ Rotate waypoint 90 degrees to the left. """
-    east_position = waypoint[0]
-    north_position = waypoint[1]
-
-    # waypoint to the east
-    if east_position >= 0:
-        # waypoint north-east -> move to north-west
-        if north_position >= 0:
-            tmp_pos_east = east_position
-            east_position = -north_position
-            north_position = tmp_pos_east
-
-        # waypoint south-east -> move to north-east
-        else:
-            tmp_pos_east = east_position
-            east_position = -north_position
-            north_position = tmp_pos_east
-            
-    # waypoint to the west
-    elif east_position < 0:
-        # waypoint north-west -> waypoint to south-west
-        if north_position >= 0:
-            tmp_pos_east = east_position
-            east_position = -north_position
-            north_position = tmp_pos_east
-
-        # waypoint south-west -> waypoint to south-east
-        else:
-            tmp_pos_east = east_position
-            east_position = -north_position
-            north_position = tmp_pos_east
-
-    return (east_position, north_position)
-
-def rotate_waypoint_90_degrees_to_the_right(waypoint):
-    """ Rotate waypoint 90 degrees to the right. """
-    east_position = waypoint[0]
-    north_position = waypoint[1]
-
-    # waypoint to the east
-    if east_position >= 0:
-        # waypoint north-east -> waypoint to south-east
-        if north_position >= 0:
-            tmp_pos_east = east_position
-            east_position = north_position
-            north_position = -tmp_pos_east
-            
-        # waypoint to the south-east -> waypoint to south-west
-        else:
-            tmp_pos_east = east_position
-            east_position = north_position
-            north_position = -tmp_pos_east
-
-    # waypoint to the west
-    elif east_position < 0:
-        # waypoint north-west -> waypoint to north-east
-        if north_position >= 0:
-            tmp_pos_east = east_position
-            east_position = north_position
-            north_position = -tmp_pos_east
-            
-        # waypoint at south-west -> waypoint to north-west
-        else:
-            tmp_pos_east = east_position
-            east_position = north_position
-            north_position = -tmp_pos_east
+    values = values.astype(np.int64)
+    quarter_turns = get_cumulative_quarter_turns(actions, values)
+    steps_east = DIRECTION_STEPS_EAST[actions] * values
+    steps_north = DIRECTION_STEPS_NORTH[actions] * values
+    forward_values = np.where(actions == ACTION_CODES['F'], values, 0)
+
+    if is_puzzle_1:
+        vectors_east, vectors_north = rotate_by_quarter_turns(1, 0, quarter_turns)
+        moves_east = steps_east + vectors_east * forward_values
+        moves_north = steps_north + vectors_north * forward_values
+    else:
+        # waypoint := R_t * (w_0 + sum(move_s / R_s)), see 'compute_ship_trajectory_along_waypoint'
+        unrotated_steps_east, unrotated_steps_north = rotate_by_quarter_turns(steps_east, steps_north,\
+                                                                              -quarter_turns % 4)
+        vectors_east, vectors_north = rotate_by_quarter_turns(int(WAYPOINT_START.real) + np.cumsum(unrotated_steps_east),\
+                                                              int(WAYPOINT_START.imag) + np.cumsum(unrotated_steps_north),\
+                                                              quarter_turns)
+        moves_east = vectors_east * forward_values
+        moves_north = vectors_north * forward_values
+
+    return np.cumsum(moves_east), np.cumsum(moves_north), vectors_east, vectors_north
+
+def create_navigation_checkpoints(actions, values, is_puzzle_1=True, interval=CHECKPOINT_INTERVAL):
+    """
+    Store the state (ship E/N and heading resp. waypoint E/N) before the first instruction and after
+    every 'interval' instructions in compact 64-bit integer arrays. The states are taken from the
+    vectorized integer states (see above).
+    Return a dictionary holding the arrays together with the interval and puzzle flag.
+    """
+    ship_east, ship_north, vector_east, vector_north = compute_navigation_states(actions, values, is_puzzle_1)
+    start_vector = 1 + 0j if is_puzzle_1 else WAYPOINT_START
+
+    # start value followed by the states after instruction interval - 1, 2 * interval - 1, ...
+    to_checkpoint_array = lambda start_value, states:\
+        array('q', np.concatenate(([int(start_value)], states[interval - 1::interval])).astype(np.int64).tobytes())
+
+    return {
+        CHECKPOINT_INTERVAL_KEY: interval,
+        IS_PUZZLE_1_KEY: is_puzzle_1,
+        SHIP_EAST_KEY: to_checkpoint_array(0, ship_east),
+        SHIP_NORTH_KEY: to_checkpoint_array(0, ship_north),
+        VECTOR_EAST_KEY: to_checkpoint_array(start_vector.real, vector_east),
+        VECTOR_NORTH_KEY: to_checkpoint_array(start_vector.imag, vector_north)
+    }
+
+def get_navigation_state(checkpoints, actions, values, step):
+    """
+    Return the state (ship E, ship N, vector E, vector N) after the first 'step' instructions: starting
+    at the nearest checkpoint before 'step', at most 'interval' - 1 instructions are replayed.
+    """
+    if not 0 <= step <= len(actions):
+        raise IndexError("Step {} out of range [0, {}]".format(step, len(actions)))
+
+    checkpoint_idx = step // checkpoints[CHECKPOINT_INTERVAL_KEY]
+    state = (checkpoints[SHIP_EAST_KEY][checkpoint_idx], checkpoints[SHIP_NORTH_KEY][checkpoint_idx],\
+             checkpoints[VECTOR_EAST_KEY][checkpoint_idx], checkpoints[VECTOR_NORTH_KEY][checkpoint_idx])
+
+    for idx in range(checkpoint_idx * checkpoints[CHECKPOINT_INTERVAL_KEY], step):
+        state = apply_navigation_instruction(state, int(actions[idx]), int(values[idx]), checkpoints[IS_PUZZLE_1_KEY])
+
+    return state
+
+def get_ship_position(checkpoints, actions, values, step):
+    """ Return the position of the ship (E, N) after the first 'step' instructions """
+    ship_east, ship_north, _, _ = get_navigation_state(checkpoints, actions, values, step)
+
+    return ship_east, ship_north
+
+def get_manhattan_distance(checkpoints, actions, values, step):
+    """ Return the Manhattan Distance of the ship from its start after the first 'step' instructions """
+    ship_east, ship_north = get_ship_position(checkpoints, actions, values, step)
 
-    return east_position, north_position  
+    return abs(ship_east) + abs(ship_north)
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
@@ -1,3 +1,5 @@
+from math import gcd
+
 BUS_SCHEDULE_FILE = "bus_schedule.txt"
 
 def get_bus_schedules():
@@ -5,16 +7,28 @@ def get_bus_schedules():
     Get the earliset timestamp to depart from above file, and all busses as list
     (ignore 'x' busses -> out of service).
     """
+    earliest_timestamp_to_depart, bus_offsets = get_bus_schedules_with_offsets()
+    possible_busses = [bus_id for _, bus_id in bus_offsets]
+
+    return earliest_timestamp_to_depart, possible_busses  
+
+def get_bus_schedules_with_offsets():
+    """
+    Get the earliset timestamp to depart from above file, and all busses as list of tuples
+    (offset, bus-ID), the offset being the position of the bus in the list (including 'x' busses).
+    """
     earliest_timestamp_to_depart = 0
-    possible_busses = []
+    bus_offsets = []
     
     with open(BUS_SCHEDULE_FILE, 'r') as bus_schedule_file:
         bus_schedule = bus_schedule_file.readlines()
         earliest_timestamp_to_depart = int(bus_schedule[0].strip())
-        possible_busses = [int(bus_id) for bus_id in bus_schedule[1].strip().split(',')\
-                           if bus_id != 'x']
+        bus_offsets = [(offset, int(bus_id)) for offset, bus_id in enumerate(bus_schedule[1].strip().split(','))\
+                       if bus_id != 'x']
 
-    return earliest_timestamp_to_depart, possible_busses  
+    return earliest_timestamp_to_depart, bus_offsets
+
+# -------------------------- Puzzle 1 --------------------------
 
 def get_earliest_possible_bus_departure(earliset_timestamp_to_depart, possible_busses):
     """
@@ -37,13 +51,65 @@ def get_earliest_possible_bus_departure(earliset_timestamp_to_depart, possible_b
 
     return bus_id_minimum_waiting_time
 
+# -------------------------- Puzzle 2 --------------------------
+
+def find_earliest_timestamp_of_aligned_departures(bus_offsets):
+    """
+    Find the earliest timestamp t at which each bus departs 'offset' minutes after t, i.e. solve
+    t = -offset (mod bus-ID) for all (offset, bus-ID) tuples at once (Chinese Remainder Theorem).
+    Return None if there is no such timestamp.
+
+    Note: The congruences are merged one after another into a single one t = remainder (mod modulus),
+    so that it works for bus-IDs which are not coprime, too.
+    """
+    remainder = 0
+    modulus = 1
+
+    for offset, bus_id in bus_offsets:
+        merged_congruence = merge_congruences(remainder, modulus, -offset % bus_id, bus_id)
+        if merged_congruence is None:
+            return None
+        remainder, modulus = merged_congruence
+
+    return remainder
+
+def merge_congruences(remainder_1, modulus_1, remainder_2, modulus_2):
+    """
+    Merge t = remainder_1 (mod modulus_1) and t = remainder_2 (mod modulus_2) into a single congruence
+    t = remainder (mod lcm(modulus_1, modulus_2)) and return (remainder, lcm). Return None if both
+    contradict each other, i.e. the difference of both remainders is not divisible by gcd(modulus_1, modulus_2).
+
+    Note: t = remainder_1 + modulus_1 * k, where k solves modulus_1 * k = remainder_2 - remainder_1
+    (mod modulus_2). Dividing by the gcd, modulus_1 becomes invertible ('pow(x, -1, m)').
+    """
+    divisor = gcd(modulus_1, modulus_2)
+    if (remainder_2 - remainder_1) % divisor:
+        return None
+
+    reduced_modulus_2 = modulus_2 // divisor
+    k = (remainder_2 - remainder_1) // divisor * pow(modulus_1 // divisor, -1, reduced_modulus_2) % reduced_modulus_2
+    merged_modulus = modulus_1 * reduced_modulus_2
+
+    return (remainder_1 + modulus_1 * k) % merged_modulus, merged_modulus
+
+# -------------------------- Solution of puzzles 1 and 2 --------------------------
+
 def compute_solution_of_puzzle():
     """ Find the earliest bus to take to the airport. """
-    earliset_timestamp_to_depart, possible_busses = get_bus_schedules()
+    earliset_timestamp_to_depart, bus_offsets = get_bus_schedules_with_offsets()
+    possible_busses = [bus_id for _, bus_id in bus_offsets]
     bus_id_minimum_waiting_time = get_earliest_possible_bus_departure(earliset_timestamp_to_depart, possible_busses)
 
     print("[+] Solution of day13/puzzle1: Bus-ID times number of minutes to wait = {}"\
           .format(bus_id_minimum_waiting_time[0] * bus_id_minimum_waiting_time[1]))
 
+    earliest_timestamp = find_earliest_timestamp_of_aligned_departures(bus_offsets)
+
+    if earliest_timestamp is None:
+        print("[!] Did not find a timestamp at which all busses depart at their offsets")
+    else:
+        print("[+] Solution of day13/puzzle2: Earliest timestamp of departures matching their offsets = {}"\
+              .format(earliest_timestamp))
+
 if __name__ == "__main__":
     compute_solution_of_puzzle()
@@ -1,6 +1,36 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 LIST_OF_PASSWORDS_FILE = "list_of_passwords.txt"
-POLICY_PASSWORD_DELIMITER = ':'
-MIN_MAX_DELIMITER = '-'
+# policy and password, e.g. '1-3 a: abcde'
+POLICY_PASSWORD_REGEX = re.compile(r"(\d+)-(\d+) (\S): (\S*)")
+MIN_CHUNK_SIZE = 2**20 # bytes of the password file handled by one worker at least
+MAX_CHUNK_SIZE = 2**26 # bytes of the password file handled by one worker at most
+
+def parse_policy_password_lines(policy_pw_lines):
+    """
+    Yield a tuple for each given line: the password-policy as a dictionary
+    {"letter" : 'a', "min" : 1, "max", 3} (here: policy is '1-3 a') and the
+    respective password. Each line is parsed once using a precompiled regex.
+    A ValueError is raised for each line not matching the expected format.
+    """
+    for policy_pw in policy_pw_lines:
+        policy_pw_match = POLICY_PASSWORD_REGEX.fullmatch(policy_pw.rstrip("\r\n"))
+        if policy_pw_match is None:
+            raise ValueError("Malformed policy/password line: {!r}".format(policy_pw))
+
+        min_letter, max_letter, letter, password = policy_pw_match.groups()
+        yield {"letter": letter, "min": int(min_letter), "max": int(max_letter)}, password
+
+def generate_policy_password_pairs():
+    """
+    Yield a (policy, password) tuple for each line of the password file.
+    The file is read line by line, i.e. the memory usage does not depend
+    on the size of the file.
+    """
+    with open(LIST_OF_PASSWORDS_FILE, 'r') as password_file:
+        yield from parse_policy_password_lines(password_file)
 
 def get_policy_password_list():
     """
@@ -8,34 +38,17 @@ def get_policy_password_list():
     as a dictionary {"letter" : 'a', "min" : 1, "max", 3} (here: policy
     is '1-3 a') and the respective password.
     """
-    policy_password_list = []
-    with open(LIST_OF_PASSWORDS_FILE, 'r') as password_file:
-        for policy_pw in password_file:
-            # split single line into policy and password
-            policy, password = policy_pw.split(POLICY_PASSWORD_DELIMITER)
-            # extract max and min letter value from policy
-            # do not care about last two letters (space and letter, e.g. ' a')
-            min_letter, max_letter = policy[:-2].split(MIN_MAX_DELIMITER)
-            policy_dict = {"letter": policy[-1], "min": int(min_letter),\
-                           "max": int(max_letter)}
-            # first password char contains a space --> remove it
-            policy_password_list.append((policy_dict, password[1:]))
-
-    return policy_password_list
+    return list(generate_policy_password_pairs())
 
 # -------------------------- Puzzle 1 --------------------------
 
 def is_valid_letter_occurrence_in_password(policy, password):
     """
-    Check if given password matches its policy: Iterate over the
-    password and count the letter of given policy. In the end check
-    if it matches the required amount of occurrences.
+    Check if given password matches its policy: Count the letter of
+    given policy in the password and check if it matches the required
+    amount of occurrences.
     """
-    nb_of_occurrences = 0
-
-    for char in password:
-        if char == policy["letter"]:
-            nb_of_occurrences += 1
+    nb_of_occurrences = password.count(policy["letter"])
 
     return policy["min"] <= nb_of_occurrences <= policy["max"]
 
@@ -64,21 +77,102 @@ def is_valid_letter_position_in_password(policy, password):
     # xor both booleans -> letter is allowed to be at exactly one position only
     return letter_at_pos_min ^ letter_at_pos_max
 
-# -------------------------- Solution of puzzles 1 and 2 --------------------------
+# -------------------------- Counting of valid passwords --------------------------
 
-def compute_solution_of_puzzle():
-    """ Find the passwords which do not match their according policy """
-    policy_password_list = get_policy_password_list()
+def count_valid_passwords(policy_password_pairs):
+    """
+    Check each (policy, password) pair against both policies in a single pass
+    and return the number of valid passwords for puzzle 1 and puzzle 2.
+    """
     nb_of_valid_passwords_puzzle_1 = 0
     nb_of_valid_passwords_puzzle_2 = 0
 
-    for policy, password in policy_password_list:
+    for policy, password in policy_password_pairs:
         if is_valid_letter_occurrence_in_password(policy, password):
             nb_of_valid_passwords_puzzle_1 += 1
 
         if is_valid_letter_position_in_password(policy, password):
             nb_of_valid_passwords_puzzle_2 += 1
 
+    return nb_of_valid_passwords_puzzle_1, nb_of_valid_passwords_puzzle_2
+
+# -------------------------- Parallel mode --------------------------
+
+def get_chunk_boundaries(file_name, nb_of_chunks):
+    """
+    Split the given file into byte-ranges (start, end), aiming at the given
+    number of chunks, but each chunk holding at most MAX_CHUNK_SIZE bytes (large
+    files result in more chunks). Each boundary is moved to the beginning of the
+    next line, so that no line is split up between two chunks.
+    """
+    file_size = os.path.getsize(file_name)
+    chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, -(-file_size // max(1, nb_of_chunks))))
+    chunk_boundaries = []
+    chunk_start = 0
+
+    with open(file_name, 'rb') as chunk_file:
+        while chunk_start < file_size:
+            chunk_file.seek(min(chunk_start + chunk_size, file_size))
+            # skip rest of the current line
+            chunk_file.readline()
+            chunk_end = min(chunk_file.tell(), file_size)
+            chunk_boundaries.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+
+    return chunk_boundaries
+
+def count_valid_passwords_in_chunk(file_name, chunk_start, chunk_end):
+    """
+    Read the byte-range [chunk_start, chunk_end) of the given password file
+    line by line and return the number of valid passwords for puzzle 1 and
+    puzzle 2.
+    """
+    return count_valid_passwords(parse_policy_password_lines(generate_chunk_lines(file_name, chunk_start,\
+                                                                                  chunk_end)))
+
+def generate_chunk_lines(file_name, chunk_start, chunk_end):
+    """
+    Yield the lines of the byte-range [chunk_start, chunk_end) of the given
+    file one after another, i.e. the chunk is never read as a whole.
+    """
+    with open(file_name, 'rb') as chunk_file:
+        chunk_file.seek(chunk_start)
+        line_start = chunk_start
+
+        for line in chunk_file:
+            if line_start >= chunk_end:
+                break
+            line_start += len(line)
+            yield line.decode()
+
+def count_valid_passwords_parallel(file_name=LIST_OF_PASSWORDS_FILE, nb_of_workers=None):
+    """
+    Split the password file into newline-aligned chunks, validate each chunk in
+    a separate process and sum up the number of valid passwords for puzzle 1
+    and puzzle 2.
+    """
+    nb_of_workers = nb_of_workers or os.cpu_count() or 1
+    chunk_boundaries = get_chunk_boundaries(file_name, nb_of_workers)
+    nb_of_valid_passwords_puzzle_1 = 0
+    nb_of_valid_passwords_puzzle_2 = 0
+
+    with ProcessPoolExecutor(max_workers=nb_of_workers) as executor:
+        chunk_counts = executor.map(count_valid_passwords_in_chunk,\
+                                    [file_name] * len(chunk_boundaries),\
+                                    *zip(*chunk_boundaries))
+        for nb_valid_puzzle_1, nb_valid_puzzle_2 in chunk_counts:
+            nb_of_valid_passwords_puzzle_1 += nb_valid_puzzle_1
+            nb_of_valid_passwords_puzzle_2 += nb_valid_puzzle_2
+
+    return nb_of_valid_passwords_puzzle_1, nb_of_valid_passwords_puzzle_2
+
+# -------------------------- Solution of puzzles 1 and 2 --------------------------
+
+def compute_solution_of_puzzle():
+    """ Find the passwords which do not match their according policy """
+    nb_of_valid_passwords_puzzle_1, nb_of_valid_passwords_puzzle_2 =\
+        count_valid_passwords(generate_policy_password_pairs())
+
     print("[+] Solution of day2/puzzle1: {} valid passwords are given"\
           .format(nb_of_valid_passwords_puzzle_1))
 
@@ -1,31 +1,44 @@
+import math
+
 import numpy as np
 
 MAP_FILE = "map.txt"
+TREE = ord('#')
 
 def create_matrix_of_map():
     """
     Fill a matrix with the map given in above file name:
     Each line is handled as single row with '.' denoting a 0,
     and each '#' representing a 1
-    """
-    map_matrix = None
-
-    with open(MAP_FILE, 'r') as map_file:
-        for map_line in map_file:
-            map_line = map_line.strip()
-            if map_matrix is None:
-                # initialize matrix once (number of columns known)
-                map_matrix = np.empty([0, len(map_line)], dtype=int)
-
-            # create new row with respective entries set to 0 (:= .) or 1 (:= #)
-            map_row = []
-            for obstacle in map_line:
-                map_row.append(0 if obstacle == '.' else 1)
-
-            # add row to matrix
-            map_matrix = np.append(map_matrix, np.array([map_row]), axis=0)
 
-    return map_matrix
+    Note: The file is memory-mapped and all complete lines are viewed as matrix
+    of shape (rows, cols + 1) without copying, i.e. the line breaks form the last
+    column, which is dropped before comparing all entries with '#' at once. The
+    last line may lack its line break and is handled separately.
+    """
+    with open(MAP_FILE, 'rb') as map_file:
+        first_map_line = map_file.readline()
+    line_length = len(first_map_line)
+    # ignore line breaks (windows line endings as well)
+    nb_cols = len(first_map_line.rstrip(b'\r\n'))
+
+    # empty file -> empty matrix (an empty file cannot be memory-mapped)
+    if line_length == 0:
+        return np.empty((0, 0), dtype=np.uint8)
+
+    map_bytes = np.memmap(MAP_FILE, dtype=np.uint8, mode='r')
+    nb_complete_rows = len(map_bytes) // line_length
+    complete_rows = map_bytes[:nb_complete_rows * line_length].reshape(nb_complete_rows, line_length)[:, :nb_cols]
+    # last line without line break (if any)
+    last_row = map_bytes[nb_complete_rows * line_length:][:nb_cols]
+    has_last_row = len(last_row) == nb_cols and nb_cols > 0
+
+    map_matrix = np.empty((nb_complete_rows + has_last_row, nb_cols), dtype=bool)
+    np.equal(complete_rows, TREE, out=map_matrix[:nb_complete_rows])
+    if has_last_row:
+        np.equal(last_row, TREE, out=map_matrix[-1])
+
+    return map_matrix.view(np.uint8)
 
 # -------------------------- Puzzle 1 (slope is (3,1)) --------------------------
 # -------------------------- Puzzle 2 (different slopes) ------------------------
@@ -38,23 +51,34 @@ def fly_through_matrix_and_count_trees(map_matrix, slope):
     Note: Due to the fact that the matrix is repeated to the right several times,
     a modulo operation with the number of columns is used to simulate it.
     """
+    return int(fly_through_matrix_and_count_trees_for_slopes(map_matrix, [slope])[0])
+
+def fly_through_matrix_and_count_trees_for_slopes(map_matrix, slopes):
+    """
+    Fly through the map with each of the given slopes (:= (right, down)) and
+    return an array holding the number of encountered trees per slope.
+
+    Note: The row and column indices of all stops of all flights are computed
+    at once using 'np.arange' (and modulo for the columns), so that the map is
+    accessed by a single gather. The trees are summed up per slope afterwards.
+    """
     nb_rows = map_matrix.shape[0]
     nb_cols = map_matrix.shape[1]
-    slope_right = slope[0]
-    slope_down = slope[1]
-    nb_trees = 0
-    col = 0
+    slopes = np.asarray(slopes, dtype=np.int64).reshape(-1, 2)
+    slopes_right = slopes[:, 0]
+    slopes_down = slopes[:, 1]
 
     # starting at index [0][0] our first stop is at index [slope_down][slope_right]
-    for row in range(slope_down, nb_rows, slope_down):
-        # wrap around matrix using modulo operation
-        col = (col + slope_right) % nb_cols
+    nb_stops = (nb_rows - 1) // slopes_down
+    slope_idxs = np.repeat(np.arange(len(slopes)), nb_stops)
+    first_stop_idxs = np.repeat(np.cumsum(nb_stops) - nb_stops, nb_stops)
+    stops = np.arange(1, len(slope_idxs) + 1) - first_stop_idxs
 
-        # tree encountered?
-        if map_matrix[row][col] == 1:
-            nb_trees += 1
+    rows = stops * slopes_down[slope_idxs]
+    # wrap around matrix using modulo operation
+    cols = (stops * slopes_right[slope_idxs]) % nb_cols
 
-    return nb_trees
+    return np.bincount(slope_idxs, weights=map_matrix[rows, cols], minlength=len(slopes)).astype(np.int64)
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
@@ -67,15 +91,12 @@ def compute_solution_of_puzzle():
     print("[+] Solution of day3/puzzle1: {} trees encountered on the flight through the map"\
           .format(nb_of_trees))
 
-    nb_of_trees_slope_1 = fly_through_matrix_and_count_trees(map_matrix, (1, 1)) # slope: 1 right, 1 down
-    nb_of_trees_slope_2 = fly_through_matrix_and_count_trees(map_matrix, (3, 1)) # slope: 3 right, 1 down
-    nb_of_trees_slope_3 = fly_through_matrix_and_count_trees(map_matrix, (5, 1)) # slope: 5 right, 1 down
-    nb_of_trees_slope_4 = fly_through_matrix_and_count_trees(map_matrix, (7, 1)) # slope: 7 right, 1 down
-    nb_of_trees_slope_5 = fly_through_matrix_and_count_trees(map_matrix, (1, 2)) # slope: 1 right, 2 down
+    # slopes: 1 right, 1 down | 3 right, 1 down | 5 right, 1 down | 7 right, 1 down | 1 right, 2 down
+    nb_of_trees_per_slope = fly_through_matrix_and_count_trees_for_slopes(map_matrix,\
+                                                                          [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)])
 
     print("[+] Solution of day3/puzzle2: {} trees encountered on the flights through the map"\
-          .format(nb_of_trees_slope_1 * nb_of_trees_slope_2 * nb_of_trees_slope_3 * nb_of_trees_slope_4 *\
-                  nb_of_trees_slope_5))
+          .format(math.prod(int(nb_of_trees) for nb_of_trees in nb_of_trees_per_slope)))
 
 if __name__ == "__main__":
     compute_solution_of_puzzle()
@@ -4,22 +4,25 @@ PASSPORTS_FILE = "passports.txt"
 
 PASSPORT_ENTRIES_DELIMITER = ' '
 KEY_VALUE_DELIMITER = ':'
+READ_BUFFER_SIZE = 2**20 # bytes
 
 REQUIRED_FIELDS = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
 OPTIONAL_FIELDS = ["cid"]
 
-def get_list_of_passports():
+HCL_REGEX = re.compile(r"#[0-9a-f]{6}")
+PID_REGEX = re.compile(r"[0-9]{9}")
+EYE_COLORS = frozenset(["amb", "blu", "brn", "gry", "grn", "hzl", "oth"])
+
+def generate_passports():
     """
-    Return a list of all passport which were scanned:
+    Yield all passports which were scanned one after another:
     - Each passport is represented internally as a dict-type
-    - Iterate through each line
-        > if an empty line is found, a passport was fully processed
+    - Iterate through each line (file is read in large buffered blocks)
+        > if an empty line is found, a passport was fully processed -> yield it
         > if a new line char is found, continue to fill currently processed passport
           with all key-value pairs in that line
     """
-    list_of_passports = []
-
-    with open(PASSPORTS_FILE, 'r') as passports_file:
+    with open(PASSPORTS_FILE, 'r', buffering=READ_BUFFER_SIZE) as passports_file:
         passport = {}
         for pp_line in passports_file:
             # remove spaces
@@ -27,8 +30,9 @@ def get_list_of_passports():
 
             # empty line?
             if not pp_line:
-                # yes -> end of currently processed passport: add it to list, start anew
-                list_of_passports.append(passport)
+                # yes -> end of currently processed passport: yield it, start anew
+                if passport:
+                    yield passport
                 passport = {}
             else:
                 # no -> continue to fill currently processed passport dict
@@ -36,95 +40,24 @@ def get_list_of_passports():
                     key, value = key_value_pair.split(KEY_VALUE_DELIMITER)
                     passport[key] = value
 
-        # do not forget to append the last passport
-        list_of_passports.append(passport)
+        # do not forget to yield the last passport
+        if passport:
+            yield passport
 
-    return list_of_passports
+def get_list_of_passports():
+    """ Return a list of all passport which were scanned """
+    return list(generate_passports())
 
 # -------------------------- Puzzle 1 --------------------------
 
-def get_passports_with_required_fields(list_of_passports):
-    """
-    Go through given list of passports (dictionaries) and get all passports which contain
-    all required fields. Only "cid" field is optional. Add them to a list and return it.
-    """
-    list_of_valid_passports = []
-
-    for passport in list_of_passports:
-        if all_required_fields_present(passport):
-            list_of_valid_passports.append(passport)
-
-    return list_of_valid_passports
-
 def all_required_fields_present(passport):
     """ Return True if given passport contains all required fields """
-    fields_of_current_passport = list(passport.keys())
-    required_fields_present = True
-
-    # check if above list of keys of the current passport contains all required keys
-    for req_field in REQUIRED_FIELDS:
-        if not req_field in fields_of_current_passport:
-            required_fields_present = False
-            break
+    required_fields_present, _ = validate_passport(passport)
 
     return required_fields_present
 
 # -------------------------- Puzzle 2 --------------------------
 
-def get_passports_with_valid_entries(list_of_valid_passports):
-    """
-    Given a list of valid passports (all required fields present), go through all
-    of them and check if each field holds a valid entry.
-    """
-    list_of_passports_with_valid_entries = []
-
-    for passport in list_of_valid_passports:
-        if all_passport_entries_valid(passport):
-            list_of_passports_with_valid_entries.append(passport)
-
-    return list_of_passports_with_valid_entries
-
-def all_passport_entries_valid(passport):
-    """
-    Check if all fields in given passport hold valid values.
-    Note: We assume here that only valid passports (:= all required fields present)
-    are given.
-    """
-    all_entries_valid = True
-
-    # check if each entry of required fields holds a valid value
-    for passport_entry in passport.items():
-        if not is_passport_entry_valid(passport_entry):
-            all_entries_valid = False
-            break
-
-    return all_entries_valid
-
-def is_passport_entry_valid(passport_entry):
-    """ Check if given passport entry (key, value) is valid """
-    pp_key = passport_entry[0]
-    pp_value = passport_entry[1]
-    is_pp_entry_valid = False
-
-    if pp_key == "byr":
-        is_pp_entry_valid = is_year_valid(pp_value, 1920, 2002)
-    elif pp_key == "iyr":
-        is_pp_entry_valid = is_year_valid(pp_value, 2010, 2020)
-    elif pp_key == "eyr":
-        is_pp_entry_valid = is_year_valid(pp_value, 2020, 2030)
-    elif pp_key == "hgt":
-        is_pp_entry_valid = is_height_valid(pp_value)
-    elif pp_key == "hcl":
-        is_pp_entry_valid = is_hcl_valid(pp_value)
-    elif pp_key == "ecl":
-        is_pp_entry_valid = is_ecl_valid(pp_value)
-    elif pp_key == "pid":
-        is_pp_entry_valid = is_pid_valid(pp_value)
-    elif pp_key == "cid":
-        is_pp_entry_valid = True # cid is optional, thus ignored
-
-    return is_pp_entry_valid
-
 def is_number_valid(number_str, number_min, number_max):
     """ Return true if number (given as str) is within given range and convertible to an integer """
     is_nb_valid = False
@@ -135,7 +68,7 @@ def is_number_valid(number_str, number_min, number_max):
         if number_min <= number <= number_max:
             is_nb_valid = True
     except:
-        print("[!] Could not parse given string: {})".format(pp_value))
+        print("[!] Could not parse given string: {})".format(number_str))
 
     return is_nb_valid
 
@@ -183,48 +116,100 @@ def is_hcl_valid(str_hcl):
     Check if given hair color (as str) is valid under given conditions:
     - '#' followed by exactly six characters (0-9 or a-f)
     """
-    is_hcl_valid = False
-    expected_length = 7
-    pattern = "(^#)[0-9, a-f]{" + str(expected_length - 1) + "}"
-
-    if len(str_hcl) == expected_length and re.match(pattern, str_hcl):
-        is_hcl_valid = True
-
-    return is_hcl_valid
+    return HCL_REGEX.fullmatch(str_hcl) is not None
 
 def is_ecl_valid(str_ecl):
     """
     Check if given eye color (as str) is valid under given conditions:
     - exactly one of: amb blu brn gry grn hzl oth
     """
-    return str_ecl in ["amb", "blu", "brn", "gry", "grn", "hzl", "oth"]
+    return str_ecl in EYE_COLORS
 
 def is_pid_valid(str_pid):
     """
     Check if given pid (as str) is valid under given conditions:
     - a nine-digit number, including leading zeroes
     """
-    is_pid_valid = False
-    expected_length = 9
-    pattern = "[0-9]{" + str(expected_length) + "}"
+    return PID_REGEX.fullmatch(str_pid) is not None
+
+# -------------------------- Passport schema --------------------------
+
+def create_passport_schema():
+    """
+    Create the schema all passports are validated against once:
+    - "field_bits": each known field is assigned to a single bit
+    - "required_mask": bitmask of all required fields
+    - "validators": dispatch table {field : function(value) -> bool}
+    """
+    field_bits = {field: 1 << bit for bit, field in enumerate(REQUIRED_FIELDS + OPTIONAL_FIELDS)}
+    required_mask = 0
+    for req_field in REQUIRED_FIELDS:
+        required_mask |= field_bits[req_field]
+
+    validators = {
+        "byr": lambda value: is_year_valid(value, 1920, 2002),
+        "iyr": lambda value: is_year_valid(value, 2010, 2020),
+        "eyr": lambda value: is_year_valid(value, 2020, 2030),
+        "hgt": is_height_valid,
+        "hcl": is_hcl_valid,
+        "ecl": is_ecl_valid,
+        "pid": is_pid_valid,
+        "cid": lambda value: True # cid is optional, thus ignored
+    }
+
+    return {"field_bits": field_bits, "required_mask": required_mask, "validators": validators}
+
+def validate_passport(passport, schema=None):
+    """
+    Validate given passport in a single pass over its entries and return two
+    booleans: all required fields present (puzzle 1) and additionally all
+    entries holding valid values (puzzle 2). Present fields are collected in
+    a bitmask which is compared to the mask of required fields in the end.
+    """
+    schema = schema or PASSPORT_SCHEMA
+    field_bits = schema["field_bits"]
+    validators = schema["validators"]
+    present_fields_mask = 0
+    all_entries_valid = True
+
+    for pp_key, pp_value in passport.items():
+        present_fields_mask |= field_bits.get(pp_key, 0)
+        if all_entries_valid:
+            field_validator = validators.get(pp_key)
+            all_entries_valid = field_validator is not None and field_validator(pp_value)
 
-    if len(str_pid) == expected_length and re.match(pattern, str_pid):
-        is_pid_valid = True
+    required_fields_present = present_fields_mask & schema["required_mask"] == schema["required_mask"]
 
-    return is_pid_valid
+    return required_fields_present, required_fields_present and all_entries_valid
+
+PASSPORT_SCHEMA = create_passport_schema()
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
+def count_valid_passports(passports):
+    """
+    Go through given passports (any iterable, e.g. the generator above) once and
+    return the number of passports containing all required fields (puzzle 1)
+    and the number of those whose entries hold valid values as well (puzzle 2).
+    """
+    nb_of_valid_passports = 0
+    nb_of_passports_with_valid_entries = 0
+
+    for passport in passports:
+        required_fields_present, all_entries_valid = validate_passport(passport)
+        nb_of_valid_passports += required_fields_present
+        nb_of_passports_with_valid_entries += all_entries_valid
+
+    return nb_of_valid_passports, nb_of_passports_with_valid_entries
+
 def compute_solution_of_puzzle():
     """ Find the total number of valid passports """
-    list_of_passports = get_list_of_passports()
-    list_of_valid_passports = get_passports_with_required_fields(list_of_passports)
+    nb_of_valid_passports, nb_of_passports_with_valid_entries = count_valid_passports(generate_passports())
 
-    print("[+] Solution of day4/puzzle1: {} passports are valid".format(len(list_of_valid_passports)))
+    print("[+] Solution of day4/puzzle1: {} passports are valid".format(nb_of_valid_passports))
 
-    list_of_passports_with_valid_entries = get_passports_with_valid_entries(list_of_valid_passports)
     print("[+] Solution of day4/puzzle2: {} passports have all entries containing valid values"\
-          .format(len(list_of_passports_with_valid_entries)))
+          .format(nb_of_passports_with_valid_entries))
 
 if __name__ == "__main__":
     compute_solution_of_puzzle()
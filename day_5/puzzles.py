@@ -1,10 +1,18 @@
+import numpy as np
+
 BOARDING_PASSES_FILE = "boarding_passes.txt"
+BOARDING_PASS_LENGTH = 10
 
 TAKE_FRONT_HALF = ['F', 'L']
 TAKE_BACK_HALF = ['B', 'R']
 
 LIST_OF_SEAT_ROWS = [i for i in range(128)]
 LIST_OF_SEAT_COLUMNS = [i for i in range(8)]
+NB_OF_SEATS = len(LIST_OF_SEAT_ROWS) * len(LIST_OF_SEAT_COLUMNS)
+
+# front half := 0, back half := 1
+SEAT_CODE_TRANSLATION = str.maketrans({**{half: '0' for half in TAKE_FRONT_HALF},\
+                                      **{half: '1' for half in TAKE_BACK_HALF}})
 
 def get_list_of_boarding_passes():
     """
@@ -39,24 +47,19 @@ def decode_seat(bin_code, list_of_seats):
     - 'F' or 'L' := front half
     - 'B' or 'R' := back half
     The number of available seats (either rows or columns) are given in 'list_of_seats'.
-    """
-    # check character to process (F,L or R,B)
-    next_step = bin_code[0]
-
-    # stop of recursion: if it is the last char, return the correct value
-    if len(bin_code) == 1:
-        return list_of_seats[0] if next_step in TAKE_FRONT_HALF else list_of_seats[1]
 
-    if next_step in TAKE_FRONT_HALF:
-        # use lower half of list, e.g. [0..127] -> [0..63]
-        end_idx = len(list_of_seats) // 2
-        list_of_seats = list_of_seats[:end_idx]
-    else:
-        # use lower half of list, e.g. [0..127] -> [64..127]
-        start_idx = len(list_of_seats) // 2
-        list_of_seats = list_of_seats[start_idx:]
+    Note: Taking the front / back half over and over again is nothing else than
+    reading the code as binary number (front := 0, back := 1).
+    """
+    return list_of_seats[decode_binary_code(bin_code)]
 
-    return decode_seat(bin_code[1:], list_of_seats)
+def decode_binary_code(bin_code):
+    """
+    Translate given 'binary' code ('F', 'L' := 0 and 'B', 'R' := 1) into
+    a string of 0s and 1s and convert it into an integer. Given a complete
+    boarding pass, the result is its seat ID (row * 8 + column).
+    """
+    return int(bin_code.translate(SEAT_CODE_TRANSLATION), 2)
 
 def compute_seat_ID(row, column):
     """ Use following formula to compute seat ID: row * 8 + column """
@@ -77,39 +80,98 @@ def get_all_seat_IDs(list_of_boarding_passes):
 
     return list_of_seat_IDs
 
+def get_array_of_seat_IDs():
+    """
+    Get all seat IDs of the boarding passes file at once: the file is read as
+    byte matrix (one boarding pass + line break per row), back halfs ('B', 'R') are
+    marked as 1 and each row is multiplied with the powers of two (dot product).
+
+    Note: The length of a row (boarding pass + '\n' or '\r\n') is taken from the
+    first line. Blank lines at the end of the file are ignored; a file whose lines
+    do not all match that layout raises a ValueError.
+    """
+    boarding_passes_bytes = np.fromfile(BOARDING_PASSES_FILE, dtype=np.uint8)
+    # ignore line breaks (and thus blank lines) at the end of the file
+    is_content = (boarding_passes_bytes != ord('\n')) & (boarding_passes_bytes != ord('\r'))
+    content_idxs = np.flatnonzero(is_content)
+    if content_idxs.size == 0:
+        return np.empty(0, dtype=np.int64)
+    boarding_passes_bytes = boarding_passes_bytes[:content_idxs[-1] + 1]
+
+    # line break of the first line ('\n' or '\r\n'), appended to the last line as well
+    first_line_break_idx = BOARDING_PASS_LENGTH
+    if len(boarding_passes_bytes) > first_line_break_idx and boarding_passes_bytes[first_line_break_idx] == ord('\r'):
+        line_break = np.array([ord('\r'), ord('\n')], dtype=np.uint8)
+    else:
+        line_break = np.array([ord('\n')], dtype=np.uint8)
+    line_length = BOARDING_PASS_LENGTH + len(line_break)
+    boarding_passes_bytes = np.concatenate((boarding_passes_bytes, line_break))
+
+    # each row has to end with the same line break
+    is_valid_layout = len(boarding_passes_bytes) % line_length == 0
+    if is_valid_layout:
+        boarding_passes_matrix = boarding_passes_bytes.reshape(-1, line_length)
+        is_valid_layout = np.all(boarding_passes_matrix[:, BOARDING_PASS_LENGTH:] == line_break)
+    if not is_valid_layout:
+        raise ValueError("Boarding passes file does not consist of lines of {} characters"\
+                         .format(BOARDING_PASS_LENGTH))
+
+    boarding_passes_matrix = boarding_passes_matrix[:, :BOARDING_PASS_LENGTH]
+    back_half_bits = (boarding_passes_matrix == ord('B')) | (boarding_passes_matrix == ord('R'))
+    powers_of_two = 1 << np.arange(BOARDING_PASS_LENGTH - 1, -1, -1, dtype=np.int64)
+
+    return back_half_bits.astype(np.int64) @ powers_of_two
+
 # -------------------------- Puzzle 2 --------------------------
 
+def find_missing_seat_IDs(seat_IDs):
+    """
+    Go through the given seat IDs (any iterable, e.g. a stream of IDs) once and
+    mark each of them in a bitmap of all seats. Return a list of all seat IDs
+    between the lowest and the highest given seat-ID which are not taken.
+    """
+    seat_bitmap = bytearray(NB_OF_SEATS)
+    min_seat_ID = None
+    max_seat_ID = None
+
+    for seat_ID in seat_IDs:
+        if seat_ID >= len(seat_bitmap):
+            # more seats than expected -> enlarge bitmap
+            seat_bitmap.extend(bytearray(seat_ID + 1 - len(seat_bitmap)))
+        seat_bitmap[seat_ID] = 1
+
+        if min_seat_ID is None or seat_ID < min_seat_ID:
+            min_seat_ID = seat_ID
+        if max_seat_ID is None or seat_ID > max_seat_ID:
+            max_seat_ID = seat_ID
+
+    if min_seat_ID is None:
+        return []
+
+    return [seat_ID for seat_ID in range(min_seat_ID + 1, max_seat_ID) if not seat_bitmap[seat_ID]]
+
 def find_my_seat_ID(list_of_seat_IDs):
     """
-    Iterate through the given list of several seat IDs and find the one missing.
-    At first, sort list in ascending order and check if each seat-ID is +1 above
-    the previous seat-ID. Once this condition does not hold, stop searching. As a
-    result my seat-ID is one above the last previous seat-ID.
+    Find the one missing seat-ID in the given list of several seat IDs: It is the
+    first missing seat-ID whose seat-IDs -1 and +1 are taken.
 
     Note: Some seats at the very front / back are also missing. Assume that my seat
     is between seats which are not missing!
     """
-    # sort list in ascending order
-    list_of_seat_IDs.sort(reverse=False)
-
-    prev_seat_ID = list_of_seat_IDs[0]
-
-    for seat_ID in list_of_seat_IDs[1:]:
-        # check if current seat-ID is +1 above the previous one
-        if seat_ID - prev_seat_ID != 1:
-            # if this is not the case, stop loop -> found my seat-ID
-            break
+    missing_seat_IDs = find_missing_seat_IDs(list_of_seat_IDs)
+    missing_seat_IDs_set = set(missing_seat_IDs)
 
-        prev_seat_ID = seat_ID
+    for seat_ID in missing_seat_IDs:
+        if seat_ID - 1 not in missing_seat_IDs_set and seat_ID + 1 not in missing_seat_IDs_set:
+            return seat_ID
 
-    return prev_seat_ID + 1
+    return None
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
 def compute_solution_of_puzzle():
     """ Find the highest seat ID and my seat-ID in all boarding passes """
-    list_of_boarding_passes = get_list_of_boarding_passes()
-    list_of_seat_IDs = get_all_seat_IDs(list_of_boarding_passes)
+    list_of_seat_IDs = get_array_of_seat_IDs().tolist()
 
     print("[+] Solution of day5/puzzle1: {} is the highest seat ID".format(max(list_of_seat_IDs)))
 
@@ -1,4 +1,3 @@
-import numpy as np
 import re
 
 BAG_RULES_FILE = "bag_rules.txt"
@@ -10,8 +9,8 @@ def create_bag_rules_dictionary():
     - value --> 'bag-rule' := dict consisting of each bag and its respective amount, e.g. '[...] contain 5 plaid teal bags,
       4 muted teal bags, 3 shiny salmon bags, 4 dull red bags.' -> {"palid teal": 5, "muted teal": 4, "shiny salmon": 3, ...}
 
-    Furthermore, create a dictionary which maps a bag-name to a unique index, which is uesd for accessing the row/column in
-    a matrix which gets created later.
+    Furthermore, create a dictionary which maps a bag-name to a unique index, which is used for accessing the nodes of
+    a graph which gets created later.
     """
     bag_rule_dict = {} # name: rule
     bag_index_dict = {} # name: index
@@ -50,106 +49,158 @@ def extract_bag_rule(bag_rule):
 
     return bag_rule_dict
 
-def create_bag_rules_matrix(bag_rules_dict, bag_index_dict):
+def create_bag_rules_graph(bag_rules_dict, bag_index_dict):
     """
-    Read all bag-rules which are present in provided dictionary and feed them into a matrix (n x n):
-    - the rows represent the bag which rule was processed
-    - the columns contain the rules (one rule per column), e.g. the number of bags which are contained in the 'row-bag'
-
-    For example, the matrix might look as follows:
-    
-    |bags |bag-1|bag-2|bag-3|...|bag-n|
-    |bag-1|  0  |  3  |  1  |...|  0  |  --> bag-1 must contain 3 bag-2 and 1 bag-3
-    |bag-2|  1  |  0  |  0  |...|  1  |  --> bag-2 must contain 1 bag-1 and 1 bag-n
+    Read all bag-rules which are present in provided dictionary and feed them into two sparse adjacency
+    dictionaries (only existing rules are stored, keyed by the bag-index):
+    - forward graph: bag --> {contained bag: amount}, e.g. {0: {1: 3, 2: 1}, 1: {}, ..}
+      --> bag-0 must contain 3 bag-1 and 1 bag-2
+    - reverse graph: bag --> [bags which contain it], e.g. {0: [], 1: [0], 2: [0], ..}
+      --> bag-1 and bag-2 are contained in bag-0
     """
-    matrix_size_n = len(bag_rules_dict)
-    bag_rules_matrix = np.empty([matrix_size_n, matrix_size_n], dtype=int)
+    forward_bag_graph = {bag_idx: {} for bag_idx in bag_index_dict.values()}
+    reverse_bag_graph = {bag_idx: [] for bag_idx in bag_index_dict.values()}
 
     # iterate over bag rules (e.g. {"b1": {"b2": 3, "b3": 1}, "b2": {}, ..})
     for bag_name, bag_rules in bag_rules_dict.items():
-        # get row of matrix depending on bag-name
-        row = bag_index_dict[bag_name]
+        bag_idx = bag_index_dict[bag_name]
 
         # iterate over all rules for above bag-name (e.g. {"b2": 3, "b3": 1})
         for bag_rule_name, bag_rule_value in bag_rules.items():
-            # fill respective matrix entry depending on given single bag rule
-            col = bag_index_dict[bag_rule_name]
-            bag_rules_matrix[row][col] = bag_rule_value 
+            contained_bag_idx = bag_index_dict[bag_rule_name]
+            forward_bag_graph[bag_idx][contained_bag_idx] = bag_rule_value
+            reverse_bag_graph[contained_bag_idx].append(bag_idx)
 
-    return bag_rules_matrix
+    return forward_bag_graph, reverse_bag_graph
 
 # -------------------------- Puzzle 1 --------------------------
 
-def get_number_of_bags_containing_given_bag(bag_rules_matrix, bag_name_col):
+def get_number_of_bags_containing_given_bag(reverse_bag_graph, bag_idx):
     """
-    Get the total amount of bags which can contain given bag (defined by 'bag_name_col').
-    For each entry in the column (defined by given 'bag_name_col' index) which is > 0,
-    the respective index is recursively added to the list.
-    Return the length of created list which represents the number of bags which can
-    contain provided bag.
+    Get the total amount of bags which can contain given bag (defined by 'bag_idx').
+    Starting at given bag, all bags containing it are visited (depth-first) using the
+    reverse graph, then all bags containing those, and so on.
+    Return the number of visited bags (without the given one).
     """
-    list_of_bags = [] # will contain all bag-indices which can contain a gold bag
-    recursive_column_bag_find(bag_rules_matrix, bag_name_col, list_of_bags)
+    visited_bags = set() # will contain all bag-indices which can contain given bag
+    bags_to_visit = [bag_idx]
 
-    return len(list_of_bags)
+    while bags_to_visit:
+        for containing_bag_idx in reverse_bag_graph[bags_to_visit.pop()]:
+            if containing_bag_idx not in visited_bags:
+                visited_bags.add(containing_bag_idx)
+                bags_to_visit.append(containing_bag_idx)
 
-def recursive_column_bag_find(bag_rules_matrix, bag_idx, list_of_bags):
+    return len(visited_bags)
+
+# -------------------------- Puzzle 2 --------------------------
+
+def find_number_of_bags_contained_in_given_bag(forward_bag_graph, bag_idx, memo=None):
     """
-    Recursively, add all indices which contain the bag-name defined by 'bag_idx' to the
-    'list_of_bags'. Function stops if no bag is found
+    Get the total number of bags which are contained in a bag defined by given 'bag_idx':
+    each contained bag counts once plus the number of bags contained within it, i.e.
+    total(bag) = sum(amount * (1 + total(contained bag))).
+    The graph is traversed depth-first (iteratively) and the total of each bag is stored in
+    'memo' ({bag-index: total}), i.e. it is computed only once, even over several calls.
+    Bags whose contained bags are still being processed are marked as 'in progress': reaching
+    such a bag again means the rules contain a cycle, which raises a ValueError.
     """
-    column = bag_rules_matrix[:, bag_idx]
+    memo = {} if memo is None else memo
+    bags_in_progress = set()
+    bags_to_visit = [(bag_idx, False)] # (bag-index, contained bags already visited)
+
+    while bags_to_visit:
+        current_bag_idx, contained_bags_visited = bags_to_visit.pop()
+
+        if contained_bags_visited:
+            # totals of all contained bags are known now
+            memo[current_bag_idx] = sum(amount * (1 + memo[contained_bag_idx])\
+                                        for contained_bag_idx, amount in forward_bag_graph[current_bag_idx].items())
+            bags_in_progress.remove(current_bag_idx)
+            continue
 
-    for idx, item in enumerate(column):
-        if idx in list_of_bags:
+        if current_bag_idx in memo:
             continue
-        if item > 0:
-            list_of_bags.extend([idx])
-            recursive_column_bag_find(bag_rules_matrix, idx, list_of_bags)
+        if current_bag_idx in bags_in_progress:
+            raise ValueError("Bag rules contain a cycle, bags cannot contain each other")
 
-# -------------------------- Puzzle 2 --------------------------
+        # totals of contained bags are required first
+        bags_in_progress.add(current_bag_idx)
+        bags_to_visit.append((current_bag_idx, True))
+        bags_to_visit.extend((contained_bag_idx, False) for contained_bag_idx in forward_bag_graph[current_bag_idx]\
+                             if contained_bag_idx not in memo)
 
-def find_number_of_bags_contained_in_given_bag(matrix, row_idx):
+    return memo[bag_idx]
+
+# -------------------------- Batch queries (puzzles 1 and 2 for all bags) --------------------------
+
+def get_topological_order_of_bags(forward_bag_graph, reverse_bag_graph):
     """
-    Recursive method to get the total number of bags which are contained in a bag defined by given 'row_idx'.
-    For each non-zero cell in above row, search all bags contained in this one, and so on..
-    Once a 'leaf'-bag is reached, the search is over (:= a single bag, which does not contain any other bag)
-    Check if next iteration will result in a 'leaf'-bag, return the number bags currently processed times the
-    number of bags contained within it. If no 'leaf'-bag is reached, return the number of bags currently processed
-    plus this number times the number of bags contained within it (recursive seach).
+    Return a list of all bag-indices in topological order, i.e. each bag is listed before all bags
+    contained in it (outermost bags first). Bags which are not contained in any remaining bag are taken
+    one after another (Kahn's algorithm). In case the rules contain a cycle, a ValueError is raised.
     """
-    row = matrix[row_idx, :]
-    
-    # recursive step: check bag(s) which are contained in current bag
-    if not np.all((row == 0)):
-        j = 0
-        for idx, factor in enumerate(row):
-            # find bags which are contained in current bag
-            if factor != 0:
-                if np.all((matrix[idx, :] == 0)):
-                    # 'leaf'-bag reached next: no need to add the factor
-                    j += (factor * find_number_of_bags_contained_in_given_bag(matrix, idx))
-                else:
-                    # 'mid'-bag reached: add the number of bags contained within curren bag plus the amount of current bags
-                    j += (factor + (factor * find_number_of_bags_contained_in_given_bag(matrix, idx)))
-        return j
-    else:
-        # recursive stop: bag which does not contain any other bags
-        return 1
-    
+    nb_of_containing_bags = {bag_idx: len(containing_bags) for bag_idx, containing_bags in reverse_bag_graph.items()}
+    bags_to_visit = [bag_idx for bag_idx, nb_containing in nb_of_containing_bags.items() if nb_containing == 0]
+    topological_order = []
+
+    while bags_to_visit:
+        bag_idx = bags_to_visit.pop()
+        topological_order.append(bag_idx)
+
+        for contained_bag_idx in forward_bag_graph[bag_idx]:
+            nb_of_containing_bags[contained_bag_idx] -= 1
+            if nb_of_containing_bags[contained_bag_idx] == 0:
+                bags_to_visit.append(contained_bag_idx)
+
+    if len(topological_order) != len(forward_bag_graph):
+        raise ValueError("Bag rules contain a cycle, bags cannot contain each other")
+
+    return topological_order
+
+def compute_bag_statistics(forward_bag_graph, reverse_bag_graph):
+    """
+    Compute for every bag at once (in one pass over the topological order, each direction):
+    - the number of bags contained in it (list indexed by bag-index), innermost bags first
+    - all bags which can contain it (bitmask per bag-index, bit i set := bag i can contain it),
+      outermost bags first: each bag inherits the containers of the bags directly containing it
+    """
+    topological_order = get_topological_order_of_bags(forward_bag_graph, reverse_bag_graph)
+    nb_of_contained_bags = [0] * len(forward_bag_graph)
+    containing_bags_masks = [0] * len(forward_bag_graph)
+
+    for bag_idx in reversed(topological_order):
+        nb_of_contained_bags[bag_idx] = sum(amount * (1 + nb_of_contained_bags[contained_bag_idx])\
+                                            for contained_bag_idx, amount in forward_bag_graph[bag_idx].items())
+
+    for bag_idx in topological_order:
+        for containing_bag_idx in reverse_bag_graph[bag_idx]:
+            containing_bags_masks[bag_idx] |= containing_bags_masks[containing_bag_idx] | (1 << containing_bag_idx)
+
+    return nb_of_contained_bags, containing_bags_masks
+
+def get_bags_containing_given_bag(containing_bags_masks, bag_idx):
+    """ Return the list of bag-indices which can contain given bag (decoded from its bitmask) """
+    containing_bags_mask = containing_bags_masks[bag_idx]
+
+    return [containing_bag_idx for containing_bag_idx in range(containing_bags_mask.bit_length())\
+            if containing_bags_mask >> containing_bag_idx & 1]
+
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
 def compute_solution_of_puzzle():
     """ Find the sum of 'yes' answers of all groups """
     bag_rules_dict, bag_index_dict = create_bag_rules_dictionary()
-    bag_rules_matrix = create_bag_rules_matrix(bag_rules_dict, bag_index_dict)
+    forward_bag_graph, reverse_bag_graph = create_bag_rules_graph(bag_rules_dict, bag_index_dict)
+
+    nb_of_contained_bags, containing_bags_masks = compute_bag_statistics(forward_bag_graph, reverse_bag_graph)
 
     shiny_gold_bag_idx = bag_index_dict["shiny gold"]
-    nb_bags_containing_a_shiny_gold_bag = get_number_of_bags_containing_given_bag(bag_rules_matrix, shiny_gold_bag_idx)
+    nb_bags_containing_a_shiny_gold_bag = containing_bags_masks[shiny_gold_bag_idx].bit_count()
     
     print("[+] Solution of day7/puzzle1: {} bags can contain a shiny gold bag".format(nb_bags_containing_a_shiny_gold_bag))
 
-    nb_bags_required_for_a_shiny_gold_bag = find_number_of_bags_contained_in_given_bag(bag_rules_matrix, shiny_gold_bag_idx)
+    nb_bags_required_for_a_shiny_gold_bag = nb_of_contained_bags[shiny_gold_bag_idx]
     
     print("[+] Solution of day7/puzzle2: {} bags are contained in one shiny golden bag".format(nb_bags_required_for_a_shiny_gold_bag))
     
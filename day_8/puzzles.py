@@ -1,3 +1,6 @@
+from array import array
+from collections import deque
+
 BOOT_CODE_FILE = "boot_code.txt"
 
 OPCODE_KEY = "op"
@@ -7,6 +10,12 @@ NOP = "nop"
 ACC = "acc"
 JMP = "jmp"
 
+# operation codes of compiled instructions
+OP_NOP = 0
+OP_ACC = 1
+OP_JMP = 2
+OPCODE_NUMBERS = {NOP: OP_NOP, ACC: OP_ACC, JMP: OP_JMP}
+
 def get_boot_instruction_list():
     """
     Read above file and extract the boot code sequence as a list of instruction. Each instruction
@@ -26,6 +35,52 @@ def get_boot_instruction_list():
 
     return instruction_list
 
+# -------------------------- Boot code VM --------------------------
+
+def compile_boot_code(instruction_list):
+    """
+    Compile given 'instruction_list' into two parallel arrays (one entry per instruction):
+    - the operation codes as numbers (see OPCODE_NUMBERS), stored as signed bytes
+    - the signed arguments (sign already applied), stored as 32-bit integers
+    For example, [{"op": "jmp", "sgn": "-", "val": 248}] results in array('b', [2]) and array('i', [-248])
+    """
+    opcodes = array('b', (OPCODE_NUMBERS[instruction[OPCODE_KEY]] for instruction in instruction_list))
+    operands = array('i', (-instruction[VALUE_KEY] if instruction[SIGN_KEY] == "-" else instruction[VALUE_KEY]\
+                           for instruction in instruction_list))
+
+    return opcodes, operands
+
+def run_boot_code(opcodes, operands):
+    """
+    Execute the compiled instructions one after another, starting at index 0, and increase the
+    accumulator value accordingly. Execution stops if
+    - an instruction is executed a second time --> cycle detected (:= infinite loop assumption)
+    - the index points right behind the last instruction --> end of instructions reached (:= success)
+    - the index points anywhere else outside of the instructions --> failure
+    Return the accumulator value and whether the end of the instructions was reached.
+    Note: Visited instructions are marked in a bytearray (one byte per instruction).
+    """
+    nb_of_instructions = len(opcodes)
+    visited_idxs = bytearray(nb_of_instructions)
+    acc_value = 0
+    idx = 0
+
+    while 0 <= idx < nb_of_instructions and not visited_idxs[idx]:
+        # mark index as visited
+        visited_idxs[idx] = 1
+        op_code = opcodes[idx]
+
+        if op_code == OP_JMP:
+            # adapt the index of the next instruction
+            idx += operands[idx]
+        else:
+            if op_code == OP_ACC:
+                acc_value += operands[idx]
+            # go on with next instruction
+            idx += 1
+
+    return acc_value, idx == nb_of_instructions
+
 # -------------------------- Puzzle 1 --------------------------
 
 def find_acc_value_right_before_infinite_loop(instruction_list):
@@ -34,136 +89,87 @@ def find_acc_value_right_before_infinite_loop(instruction_list):
     accumulator value accordingly.
     Note: It is assumed that an infinite loop is found once an instruction is executed a second time.
     """
-    return run_instruction(instruction_list, 0, [])
+    acc_value, _ = run_boot_code(*compile_boot_code(instruction_list))
 
-def run_instruction(instruction_list, idx, visited_idxs):
-    """
-    Get instruction at index 'idx' of 'instruction_list':
-    - if instruction at index 'idx' was already run, stop --> cycle detected (:= infinite loop assumption)
-    - if 'idx' is out-of-range, stop --> end of instruction list reached (:= successful case)
-    - run instruction and recursively execute next instruction, always incrementing the acc-value if needed
-    """
-    # stop if cycle was detected or end of list reached
-    if idx in visited_idxs or idx == len(instruction_list):
-        return 0
-
-    # mark index as visited
-    visited_idxs.append(idx)
-
-    acc_val = 0
-    next_idx = idx
-    instruction = instruction_list[idx]
-    op_code = instruction[OPCODE_KEY]
-    sign = instruction[SIGN_KEY]
-    value = instruction[VALUE_KEY]
-
-    if op_code == NOP:
-        # no operation, go on with next instruction
-        next_idx += 1
-    
-    elif op_code == ACC:
-        # depending on given sign, adapt the acc-value
-        if sign == "+":
-            acc_val += value
-        elif sign == "-":
-            acc_val -= value
-        # go on with next instruction
-        next_idx += 1
-
-    elif op_code == JMP:
-        # depending on given sign, adapt the index of the next instruction
-        if sign == "+":
-            next_idx += value
-        elif sign == "-":
-            next_idx -= value
-
-    return acc_val + run_instruction(instruction_list, next_idx, visited_idxs)
+    return acc_value
 
 # -------------------------- Puzzle 2 --------------------------
 
-def get_instructions_to_change(instruction_list):
+def get_next_idx(op_code, operand, idx):
+    """ Return the index of the instruction executed after the one at 'idx' """
+    return idx + operand if op_code == OP_JMP else idx + 1
+
+def find_terminating_idxs(opcodes, operands):
     """
-    Return a list of tuples, each tuple holding the index and operation code which needs
-    to be applied/changed, e.g. index 1 and operation code JMP will result in following
-    entry: (1, NOP)
+    Return a bytearray marking each index (including the one right behind the last instruction)
+    from which the end of the instructions is reached without any change. All instructions pointing
+    to each index are collected (reverse graph) and searched breadth-first, starting at the end.
     """
-    instruction_indices_list = []
-    for idx, instruction in enumerate(instruction_list):
-        op_code = instruction[OPCODE_KEY]
+    nb_of_instructions = len(opcodes)
+    previous_idxs = [[] for _ in range(nb_of_instructions + 1)]
 
-        # do not care about ACC operation code
-        if op_code in [NOP, JMP]:
-            if op_code == JMP:
-                # change JMP to NOP
-                instruction_indices_list.append((idx, NOP))
-            elif op_code == NOP:
-                # change NOP to JMP
-                instruction_indices_list.append((idx, JMP))
+    for idx in range(nb_of_instructions):
+        next_idx = get_next_idx(opcodes[idx], operands[idx], idx)
+        if 0 <= next_idx <= nb_of_instructions:
+            previous_idxs[next_idx].append(idx)
 
-    return instruction_indices_list                                           
+    terminating_idxs = bytearray(nb_of_instructions + 1)
+    terminating_idxs[nb_of_instructions] = 1
+    idxs_to_visit = deque([nb_of_instructions])
 
-def find_acc_value_of_loop_break(instruction_list):
+    while idxs_to_visit:
+        for previous_idx in previous_idxs[idxs_to_visit.popleft()]:
+            if not terminating_idxs[previous_idx]:
+                terminating_idxs[previous_idx] = 1
+                idxs_to_visit.append(previous_idx)
+
+    return terminating_idxs
+
+def find_instruction_to_repair(opcodes, operands):
     """
-    Use the recursive function defined below to try every NOP/JMP change until a break in the infinite
-    loop is found. Once the break was found, calculate the accumulated value like in puzzle 1 and
-    return it.
+    Walk along the (unchanged) path of executed instructions once and return the index of the first
+    NOP/JMP which leads to a terminating index once it is changed. Return None if no such instruction
+    is found or the unchanged instructions terminate already (there is no loop to break then).
     """
-    acc_value = -1
-    instruction_indices_list = get_instructions_to_change(instruction_list) 
-    
-    for idx, op_code in instruction_indices_list:
-        inst_list = get_boot_instruction_list() # new un-manipulated list of instructions
-        (inst_list[idx])[OPCODE_KEY] = op_code
-
-        # found a break in the infinite loop
-        if find_non_infinite_loop(inst_list, 0, []):
-            acc_value = run_instruction(inst_list, 0, [])
-            break
+    _, end_reached = run_boot_code(opcodes, operands)
+    if end_reached:
+        return None
 
-    return acc_value
+    nb_of_instructions = len(opcodes)
+    terminating_idxs = find_terminating_idxs(opcodes, operands)
+    visited_idxs = bytearray(nb_of_instructions)
+    idx = 0
+
+    while 0 <= idx < nb_of_instructions and not visited_idxs[idx]:
+        visited_idxs[idx] = 1
+        op_code = opcodes[idx]
+
+        if op_code in (OP_NOP, OP_JMP):
+            changed_op_code = OP_JMP if op_code == OP_NOP else OP_NOP
+            changed_next_idx = get_next_idx(changed_op_code, operands[idx], idx)
+            if 0 <= changed_next_idx <= nb_of_instructions and terminating_idxs[changed_next_idx]:
+                return idx
 
-def find_non_infinite_loop(instruction_list, idx, visited_idxs):
+        idx = get_next_idx(op_code, operands[idx], idx)
+
+    return None
+
+def find_acc_value_of_loop_break(instruction_list):
     """
-    Get instruction at index 'idx' of 'instruction_list':
-    - if instruction at index 'idx' was already run, stop --> cycle detected (:= infinite loop assumption)
-    - if instruction at index 'idx' is out of range, stop --> end of instruction-list reached --> success
-      in un-breaking infinite loop
-    - run instruction and recursively execute next instruction
+    Find the one NOP/JMP change which breaks the infinite loop (see above) and apply it to the
+    compiled instructions. Return the accumulated value (calculated like in puzzle 1) afterwards,
+    or -1 if no change lets the instructions finish.
     """
-    # stop if cycle was detected, or last line was not executed --> fail
-    if idx in visited_idxs or idx > len(instruction_list):
-        return False
-
-    # stop if end of instruction list is reached --> success
-    if idx == len(instruction_list):
-        return True
-
-    # mark index as visited
-    visited_idxs.append(idx)
-    
-    next_idx = idx
-    instruction = instruction_list[idx]
-    op_code = instruction[OPCODE_KEY]
-    sign = instruction[SIGN_KEY]
-    value = instruction[VALUE_KEY]
-
-    if op_code == NOP:
-        # no operation, go on with next instruction
-        next_idx += 1
-    
-    elif op_code == ACC:
-        # no need to care about it now, go on with next instruction
-        next_idx += 1
-
-    elif op_code == JMP:
-        # depending on given sign, adapt the index of the next instruction
-        if sign == "+":
-            next_idx += value
-        elif sign == "-":
-            next_idx -= value
-
-    return (True and find_non_infinite_loop(instruction_list, next_idx, visited_idxs))
-    
+    opcodes, operands = compile_boot_code(instruction_list)
+    repair_idx = find_instruction_to_repair(opcodes, operands)
+    if repair_idx is None:
+        return -1
+
+    opcodes[repair_idx] = OP_JMP if opcodes[repair_idx] == OP_NOP else OP_NOP
+    acc_value, end_reached = run_boot_code(opcodes, operands)
+
+    return acc_value if end_reached else -1
+
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
 def compute_solution_of_puzzle():
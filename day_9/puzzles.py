@@ -1,6 +1,7 @@
-import numpy as np
+from collections import Counter, deque
 
 XMAS_CODE_FILE = "xmas_code.txt"
+PREAMBLE_LENGTH = 25
 
 def get_numbers_list():
     """ Return the content of above file as a list of numbers. """
@@ -12,117 +13,118 @@ def get_numbers_list():
 
     return numbers_list
 
+def generate_numbers():
+    """ Yield the content of above file number by number. """
+    with open(XMAS_CODE_FILE, 'r') as numbers_file:
+        for number in numbers_file:
+            yield int(number)
+
 # -------------------------- Puzzle 1 --------------------------
 
-def create_sum_matrix(numbers_list):
+def generate_invalid_numbers(numbers, preamble_length=PREAMBLE_LENGTH):
     """
-    Create a matrix (m x m) with the provided 'numbers_list' as row and column.
-    Each cell content will be the sum of the numbers associated with current row and column.
-
-    For example, let 'numbers_list' be [2, 5, 6, 4] then this matrix will look as follows:
-    0 7  8  6
-    7 0  11 9
-    8 11 0  10
-    6 9  10 0
+    Go through provided 'numbers' (any iterable, e.g. an endless stream) and yield each number
+    which is not the sum of 2 values out of the previous 'preamble_length' numbers.
+
+    Note: first 'preamble_length' numbers are skipped as präamble. The previous numbers are kept
+    in a sliding window (deque) together with their number of occurrences (Counter), so that each
+    number is checked in O(preamble_length).
     """
-    matrix_size = len(numbers_list)
-    sum_matrix = np.empty((matrix_size, matrix_size))
+    window = deque()
+    window_counter = Counter()
+
+    for number in numbers:
+        if len(window) == preamble_length:
+            if not is_number_valid(window_counter, number):
+                # found number which does not match the requirements
+                yield number
 
-    for row_idx in range(matrix_size):
-        for col_idx in range(matrix_size):
-            if row_idx != col_idx:
-                sum_matrix[row_idx][col_idx] = numbers_list[row_idx] + numbers_list[col_idx]
+            # slide window: remove the oldest number
+            oldest_number = window.popleft()
+            window_counter[oldest_number] -= 1
+            if not window_counter[oldest_number]:
+                del window_counter[oldest_number]
 
-    return sum_matrix
+        window.append(number)
+        window_counter[number] += 1
 
-def find_non_matching_number(numbers_list, sum_matrix):
+def find_non_matching_number(numbers, preamble_length=PREAMBLE_LENGTH):
     """
-    Iterate to provided 'numbers_list' and check if 2 values out of the previous 25 numbers
-    add up to the currently checked number.
-    
-    Note: first 25 numbers are skipped as präamble.
+    Return the first number in provided 'numbers' which is not the sum of 2 values out of the
+    previous 'preamble_length' numbers or -1, if there is none.
     """
-    idx = 25
-    non_matching_number = -1
+    return next(generate_invalid_numbers(numbers, preamble_length), -1)
 
-    for number in numbers_list[25:]:
-        if not is_number_valid(sum_matrix, number, idx):
-            # found number which does not match the requirements
-            non_matching_number = number
-            break
+def is_number_valid(window_counter, number):
+    """
+    Go through each (distinct) number of the window and check if its complement (number - value)
+    is within the window as well. If so, 'number' is valid. A value may be used twice only if
+    it occurs twice within the window.
+    """
+    for value in window_counter:
+        complement = number - value
+        if complement in window_counter and (complement != value or window_counter[value] > 1):
+            return True
 
-        idx += 1
+    return False
 
-    return non_matching_number
+# -------------------------- Puzzle 2 --------------------------
 
-def is_number_valid(sum_matrix, number, idx):
+def find_continuous_sequence_which_add_up_to_given_number(numbers_list, magic_number):
     """
-    Go through each row of the matrix which is within given range (determined by 'idx').
-    If 'number' is within one of these rows, it is valid, because the cell contents contain
-    the summed-up values.
+    Find a continuous sequence (of at least two numbers) in above list of numbers which add up to
+    the given 'magic_number' and return it. If the list holds non-negative numbers only, a sliding
+    window is used, otherwise the prefix sums are searched. Return an empty list if there is none.
     """
-    # define range of matrix -> m[idx_low : idx][idx_low : idx]
-    idx_low = idx - 25
+    if all(number >= 0 for number in numbers_list):
+        return find_continuous_sequence_with_sliding_window(numbers_list, magic_number)
 
-    return np.any(sum_matrix[idx_low:idx, idx_low:idx] == number)
+    return find_continuous_sequence_with_prefix_sums(numbers_list, magic_number)
 
-# -------------------------- Puzzle 2 --------------------------
+def find_continuous_sequence_with_sliding_window(numbers_list, magic_number):
+    """
+    Move the end of a window over the non-negative 'numbers_list' and keep track of the sum of
+    the numbers within it. As long as the sum is too large, the start of the window is moved
+    forward, i.e. each number is added and removed at most once.
 
-def create_continuous_sum_matrix(numbers_list):
+    For example, let 'numbers_list' be [2, 5, 6, 4] then searching for 'magic_number' 10 results in
+    [2] -> [2, 5] -> [2, 5, 6] (too large) -> [5, 6] (too large) -> [6] -> [6, 4] = 10
     """
-    Create a matrix (m x m) with the provided 'numbers_list' as row and column.
-    Each cell content will be the sum of the previous numbers plus the current one.
+    start_idx = 0
+    window_sum = 0
 
-    For example, let 'numbers_list' be [2, 5, 6, 4] then this matrix will look as follows:
-    0 7 13 17
-    0 0 11 15
-    0 0 0  10
-    0 0 0  0
+    for end_idx, number in enumerate(numbers_list):
+        window_sum += number
 
-    Note: created matrix will be symmetrical --> only consider one half of it!
-    """
-    matrix_size = len(numbers_list)
-    cont_sum_matrix = np.empty((matrix_size, matrix_size))
+        while window_sum > magic_number and start_idx < end_idx:
+            window_sum -= numbers_list[start_idx]
+            start_idx += 1
+
+        if window_sum == magic_number and end_idx > start_idx:
+            return numbers_list[start_idx:end_idx + 1]
 
-    for row_idx in range(matrix_size):
-        for col_idx in range(matrix_size):
-            if row_idx < col_idx:
-                cont_sum_matrix[row_idx][col_idx] = cont_sum_matrix[row_idx][col_idx - 1] + numbers_list[col_idx]
-    
-    return cont_sum_matrix
+    return []
 
-def find_continuous_sequence_which_add_up_to_given_number(numbers_list, cont_sum_matrix, magic_number):
+def find_continuous_sequence_with_prefix_sums(numbers_list, magic_number):
     """
-    Find a continuous sequence in above list of numbers which add up to the given
-    'magic_number'. Use a matrix where each adjacent cell in a row is the sum of the
-    previous cell content plus the number associated with current cell.
-    Return the sequence in the 'numbers_list' which is determined by the found sequence.
-
-    For example, let 'numbers_list' be [2, 5, 6, 4] then 'cont_sum_matrix' will look as follows:
-    0 7 13 17
-    0 0 11 15
-    0 0 0  10
-    0 0 0  0
-    Searching for 'magix_number' 11 will result in row with index 1 and cell with index 2. The resulting sequence
-    will thus be numbers_list[1:(1+2+1)] = [2, 5, 4] --> 2 + 5 + 4 = 11
+    Sum up 'numbers_list' step by step (prefix sums) and remember the first index of each prefix sum.
+    A sequence from 'start_idx' to 'end_idx' adds up to 'magic_number' if the prefix sum up to
+    'end_idx' minus 'magic_number' was seen at 'start_idx' before. Works with negative numbers, too.
     """
-    start_idx = -1
-    end_idx = -1
-    
-    for idx, row in enumerate(cont_sum_matrix):
-        current_sum = 0
+    prefix_sum_idxs = {} # prefix sum: first index
+    prefix_sums = [0, 0] # prefix sums of the previous two indices
 
-        # symmetrical matrix --> consider only upper half of it
-        for row_idx, value in enumerate(row[idx:]):
-            if value == magic_number:
-                start_idx = idx
-                end_idx = start_idx + row_idx + 1
-                break
+    for end_idx, number in enumerate(numbers_list):
+        # sequences need at least two numbers -> prefix sum before the previous number is a valid start
+        if end_idx >= 1:
+            prefix_sum_idxs.setdefault(prefix_sums[0], end_idx - 1)
+        prefix_sums = [prefix_sums[1], prefix_sums[1] + number]
 
-        if start_idx != -1:
-            break
+        start_idx = prefix_sum_idxs.get(prefix_sums[1] - magic_number)
+        if start_idx is not None:
+            return numbers_list[start_idx:end_idx + 1]
 
-    return numbers_list[start_idx:end_idx]
+    return []
 
 # -------------------------- Solution of puzzles 1 and 2 --------------------------
 
@@ -132,14 +134,11 @@ def compute_solution_of_puzzle():
     needs to be the sum of two values out of the 25 previous numbers.
     """
     numbers_list = get_numbers_list()
-    sum_matrix = create_sum_matrix(numbers_list)
-    non_matching_number = find_non_matching_number(numbers_list, sum_matrix)
+    non_matching_number = find_non_matching_number(numbers_list)
 
     print("[+] Solution of day9/puzzle1: {} breaks the list of numbers".format(non_matching_number))
 
-    continuous_sum_matrix = create_continuous_sum_matrix(numbers_list)
-    continuous_sequence = find_continuous_sequence_which_add_up_to_given_number(numbers_list,\
-                                continuous_sum_matrix, non_matching_number)
+    continuous_sequence = find_continuous_sequence_which_add_up_to_given_number(numbers_list, non_matching_number)
     sum_of_largest_and_smallest_value = max(continuous_sequence) + min(continuous_sequence)
 
     print("[+] Solution of day9/puzzle2: The sum of the smallest and largest number in continous sequence is: {}"\